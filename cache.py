@@ -0,0 +1,279 @@
+# cache.py (c) 2025 drAIML MIT license
+
+import os
+import time
+import queue
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Future
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from cachetools import TTLCache
+from logger import get_logger
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+# Sampling at or below this temperature is deterministic enough to always reuse a response
+CACHE_MAX_TEMPERATURE = 0.2
+
+# Semantic cache is opt-in: it needs sentence-transformers, faiss and numpy
+SEMANTIC_CACHE_ENABLED = _env_flag("DRAIML_SEMANTIC_CACHE")
+
+# Opt-in reuse of replies from handlers sampling at their default or a higher
+# temperature; trades response variety for latency and cost. Implied by the
+# semantic cache, which would otherwise never be consulted.
+RESPONSE_CACHE_ENABLED = _env_flag("DRAIML_RESPONSE_CACHE") or SEMANTIC_CACHE_ENABLED
+SEMANTIC_CACHE_MODEL = "all-MiniLM-L6-v2"
+SEMANTIC_CACHE_THRESHOLD = 0.92
+
+class ResponseCache:
+    """Thread-safe exact-match cache for model responses"""
+
+    def __init__(self, maxsize: int = 4096, ttl: int = 1800):
+        self.logger = get_logger('cache')
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, prompt: str) -> str:
+        """Build cache key from the (model, system prompt, prompt) triple"""
+        digest = hashlib.sha256(
+            f"{model}\x1f{system_prompt}\x1f{prompt}".encode()
+        ).hexdigest()
+        return f"response:{digest}"
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: str, response: str):
+        with self._lock:
+            self._cache[key] = response
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+class EmbeddingBatcher:
+    """Coalesces concurrent encode requests into one batched forward pass"""
+
+    def __init__(self, encoder, max_batch: int = 32, window: float = 0.005):
+        self.encoder = encoder
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        threading.Thread(target=self._worker, name="embedding-batcher", daemon=True).start()
+
+    def encode(self, text: str):
+        """Return a normalized float32 embedding of shape (1, dim)"""
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def _worker(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                vectors = self.encoder.encode(
+                    [text for text, _ in batch],
+                    batch_size=self.max_batch,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                ).astype("float32")
+                for (_, future), vector in zip(batch, vectors):
+                    future.set_result(vector.reshape(1, -1))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+class SemanticCache:
+    """Similarity cache that matches paraphrased prompts via sentence embeddings"""
+
+    def __init__(self,
+                 enabled: bool = SEMANTIC_CACHE_ENABLED,
+                 model_name: str = SEMANTIC_CACHE_MODEL,
+                 threshold: float = SEMANTIC_CACHE_THRESHOLD,
+                 maxsize: int = 4096):
+        self.logger = get_logger('cache')
+        self.enabled = enabled
+        self.model_name = model_name
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._batcher: Optional[EmbeddingBatcher] = None
+        self._faiss = None
+        # One inner-product index per (model, system prompt) namespace
+        self._indexes: Dict[str, Any] = {}
+        self._responses: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> bool:
+        """Lazily import optional dependencies and load the embedding model"""
+        if self._batcher is not None:
+            return True
+        try:
+            import faiss
+            from sentence_transformers import SentenceTransformer
+            self._faiss = faiss
+            self._batcher = EmbeddingBatcher(SentenceTransformer(self.model_name))
+            self.logger.info(f"Semantic cache loaded: {self.model_name}")
+            return True
+        except Exception as e:
+            self.enabled = False
+            self.logger.warning(f"Semantic cache disabled: {e}")
+            return False
+
+    def warm(self) -> bool:
+        """Load the embedding model ahead of the first request; no-op when disabled"""
+        return self.enabled and self._load()
+
+    def embed(self, prompt: str):
+        """Return a normalized float32 embedding of shape (1, dim)"""
+        return self._batcher.encode(prompt)
+
+    def lookup(self, namespace: str, prompt: str) -> Tuple[Optional[str], Any]:
+        """Return (cached response or None, prompt embedding)"""
+        if not self.enabled or not self._load():
+            return None, None
+        vector = self.embed(prompt)
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None or index.ntotal == 0:
+                return None, vector
+            scores, ids = index.search(vector, 1)
+            if scores[0][0] >= self.threshold:
+                return self._responses[namespace][ids[0][0]], vector
+        return None, vector
+
+    def store(self, namespace: str, vector, response: str):
+        if vector is None:
+            return
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None or index.ntotal >= self.maxsize:
+                index = self._faiss.IndexFlatIP(vector.shape[1])
+                self._indexes[namespace] = index
+                self._responses[namespace] = []
+            index.add(vector)
+            self._responses[namespace].append(response)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+            self._responses.clear()
+
+# Global instances shared by all model handlers
+response_cache = ResponseCache()
+semantic_cache = SemanticCache()
+
+def is_cacheable(handler) -> bool:
+    """Cache near-deterministic handlers always, any handler when opted in"""
+    if RESPONSE_CACHE_ENABLED:
+        return True
+    temperature = getattr(handler, "temperature", None)
+    return temperature is not None and temperature <= CACHE_MAX_TEMPERATURE
+
+def _lookup(handler, prompt: str) -> Tuple[str, Optional[str], Any]:
+    """Check exact then semantic cache; returns (key, response, embedding)"""
+    key = response_cache.make_key(handler.selected_model, handler.system_prompt, prompt)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return key, cached, None
+    namespace = response_cache.make_key(handler.selected_model, handler.system_prompt, "")
+    cached, vector = semantic_cache.lookup(namespace, prompt)
+    if cached is not None:
+        response_cache.set(key, cached)
+    return key, cached, vector
+
+async def _alookup(handler, prompt: str) -> Tuple[str, Optional[str], Any]:
+    """_lookup for coroutines; the semantic lookup blocks on the embedding
+    batcher, so it runs in a worker thread and concurrent prompts batch together"""
+    if not semantic_cache.enabled:
+        return _lookup(handler, prompt)
+    return await asyncio.get_running_loop().run_in_executor(None, _lookup, handler, prompt)
+
+def _store(handler, key: str, vector, response: str):
+    response_cache.set(key, response)
+    namespace = response_cache.make_key(handler.selected_model, handler.system_prompt, "")
+    semantic_cache.store(namespace, vector, response)
+
+def cached_response(method: Callable) -> Callable:
+    """
+    Cache a handler method of the form method(self, prompt) -> str.
+
+    Checks the exact-match cache first, then the semantic cache when enabled.
+    The handler must expose selected_model, system_prompt and temperature.
+    Exceptions propagate and are never cached. Works for sync and async methods.
+    """
+    if asyncio.iscoroutinefunction(method):
+        @wraps(method)
+        async def async_wrapper(self, prompt: str) -> str:
+            if not is_cacheable(self):
+                return await method(self, prompt)
+            key, cached, vector = await _alookup(self, prompt)
+            if cached is not None:
+                return cached
+            response = await method(self, prompt)
+            _store(self, key, vector, response)
+            return response
+        return async_wrapper
+
+    @wraps(method)
+    def wrapper(self, prompt: str) -> str:
+        if not is_cacheable(self):
+            return method(self, prompt)
+        key, cached, vector = _lookup(self, prompt)
+        if cached is not None:
+            return cached
+        response = method(self, prompt)
+        _store(self, key, vector, response)
+        return response
+    return wrapper
+
+def cached_stream(method: Callable) -> Callable:
+    """
+    Cache a streaming handler method of the form method(self, prompt) -> Iterator[str].
+
+    A hit yields the whole cached response as one chunk; a miss is stored once
+    the stream has been fully consumed without error.
+    """
+    @wraps(method)
+    def wrapper(self, prompt: str) -> Iterator[str]:
+        if not is_cacheable(self):
+            yield from method(self, prompt)
+            return
+        key, cached, vector = _lookup(self, prompt)
+        if cached is not None:
+            yield cached
+            return
+        chunks = []
+        for chunk in method(self, prompt):
+            chunks.append(chunk)
+            yield chunk
+        _store(self, key, vector, "".join(chunks))
+    return wrapper
+
+# Module exports
+__all__ = [
+    'ResponseCache',
+    'SemanticCache',
+    'EmbeddingBatcher',
+    'response_cache',
+    'semantic_cache',
+    'cached_response',
+    'cached_stream',
+    'is_cacheable',
+    'CACHE_MAX_TEMPERATURE',
+    'RESPONSE_CACHE_ENABLED'
+]
@@ -1,36 +1,153 @@
 # chatter.py (c) 2025 Gregory L. Magnusson MIT license
 
 import os
+import atexit
 import logging
-import json
+import ujson
+import hashlib
+import asyncio
+import threading
+import aiohttp
+import httpx
 import requests
-from typing import Dict, List, Optional, Union
+from requests.adapters import HTTPAdapter
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Union
 from datetime import datetime
-from openai import OpenAI
-from groq import Groq
-import subprocess
+from functools import lru_cache
 from logger import get_logger
 from config import model_config
+from cache import cached_response, cached_stream
+
+# Initialize logger
+logger = get_logger('chatter')
+
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+
+# Rate limits and transient server errors worth retrying
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+TOGETHER_MAX_RETRIES = 3
+
+# Keep-alive HTTP/2 pool shared by the OpenAI-SDK handlers (OpenAI and Groq)
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+def shared_http_client() -> httpx.Client:
+    """Return the process-wide sync HTTP client, creating it on first use"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=300)
+            )
+    return _http_client
+
+# HTTP/2 pool shared by the async handlers (Together); auth is sent per request
+_async_client: Optional[httpx.AsyncClient] = None
+
+def shared_async_client() -> httpx.AsyncClient:
+    """Return the process-wide async HTTP client, creating it on first use"""
+    global _async_client
+    with _http_client_lock:
+        if _async_client is None or _async_client.is_closed:
+            # Multiplexes concurrent requests over one pooled TLS connection
+            _async_client = httpx.AsyncClient(
+                timeout=60.0,
+                transport=httpx.AsyncHTTPTransport(
+                    http2=True,
+                    retries=3,
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+                )
+            )
+    return _async_client
+
+# Background event loop shared by sync wrappers so HTTP sessions outlive each call
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop, starting its thread on first use"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="chatter-loop", daemon=True
+            ).start()
+    return _loop
+
+def _run_sync(coro, timeout: float = 610):
+    """Run a coroutine on the background loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result(timeout=timeout)
+
+_STREAM_END = object()
+
+async def _anext(agen: AsyncIterator):
+    try:
+        return await agen.__anext__()
+    except StopAsyncIteration:
+        return _STREAM_END
+
+def _iter_sync(agen: AsyncIterator, timeout: float = 610) -> Iterator:
+    """Drive an async generator on the background loop from synchronous code"""
+    try:
+        while True:
+            item = _run_sync(_anext(agen), timeout)
+            if item is _STREAM_END:
+                return
+            yield item
+    finally:
+        _run_sync(agen.aclose(), timeout)
+
+# Upper bound on in-flight requests per batch, to stay inside provider rate limits
+BATCH_CONCURRENCY = 4
+
+async def _gather_bounded(generate, prompts: List[str], limit: int = BATCH_CONCURRENCY) -> List[str]:
+    """Like asyncio.gather over prompts, but with at most `limit` calls in flight"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def one(prompt: str) -> str:
+        async with semaphore:
+            return await generate(prompt)
+
+    return await asyncio.gather(*map(one, prompts))
+
+SYSTEM_PROMPT_FILE = "prompt.txt"
+
+@lru_cache(maxsize=1)
+def _read_system_prompt(mtime: float) -> str:
+    """Read system prompt from disk; keyed on mtime so edits invalidate the cache"""
+    with open(SYSTEM_PROMPT_FILE, "r", encoding="utf-8") as f:
+        return f.read().strip()
 
 def load_system_prompt() -> str:
     """Load system prompt from file"""
     try:
-        with open("prompt.txt", "r", encoding="utf-8") as f:
-            return f.read().strip()
+        return _read_system_prompt(os.stat(SYSTEM_PROMPT_FILE).st_mtime)
     except Exception as e:
-        logging.error(f"Error loading system prompt: {e}")
+        logger.error(f"Error loading system prompt: {e}")
         return "You are a medical AI assistant. Please provide accurate and helpful medical information."
 
 class GPT4o:
     """OpenAI model handler"""
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, http_client: Optional[httpx.Client] = None):
         self.logger = get_logger('openai')
         os.environ["OPENAI_API_KEY"] = api_key
         try:
-            self.client = OpenAI()  # No arguments needed
+            # Imported here so deployments that never use OpenAI skip the SDK import
+            from openai import OpenAI
+            self.client = OpenAI(http_client=http_client or shared_http_client())
             self.system_prompt = load_system_prompt()
+            # Built once so every request shares the same system message
+            self._sys_msg = {"role": "system", "content": self.system_prompt}
             self.selected_model = "gpt-4"
+            self.temperature = None  # Provider default
+            # Routes requests sharing the system prompt prefix to the same prompt cache
+            self.prompt_cache_key = hashlib.sha256(
+                self.system_prompt.encode()
+            ).hexdigest()[:16]
         except Exception as e:
             self.logger.error(f"OpenAI Error: {e}")
             raise
@@ -44,24 +161,57 @@ class GPT4o:
             self.logger.error(f"OpenAI Error selecting model: {e}")
             return False
 
-    def generate_response(self, prompt: str) -> str:
-        try:
-            messages = [
-                {"role": "system", "content": self.system_prompt},
-                {"role": "user", "content": prompt}
-            ]
+    def _request_params(self, prompt: str) -> Dict:
+        messages = [
+            self._sys_msg,
+            {"role": "user", "content": prompt}
+        ]
+        params = {
+            "model": self.selected_model,
+            "messages": messages,
+            "extra_body": {"prompt_cache_key": self.prompt_cache_key}
+        }
+        if self.temperature is not None:
+            params["temperature"] = self.temperature
+        return params
 
-            chat_completion = self.client.chat.completions.create(
-                model=self.selected_model,
-                messages=messages
-            )
+    @cached_response
+    def _complete(self, prompt: str) -> str:
+        chat_completion = self.client.chat.completions.create(**self._request_params(prompt))
+        return chat_completion.choices[0].message.content
 
-            return chat_completion.choices[0].message.content
+    @cached_stream
+    def _stream(self, prompt: str) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            **self._request_params(prompt), stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
+    def generate_response(self, prompt: str) -> str:
+        try:
+            return self._complete(prompt)
         except Exception as e:
             self.logger.error(f"OpenAI Error: {e}")
             return f"Error generating response: {str(e)}"
 
+    def generate_response_stream(self, prompt: str) -> Iterator[str]:
+        """Yield the response incrementally as it is generated"""
+        try:
+            yield from self._stream(prompt)
+        except Exception as e:
+            self.logger.error(f"OpenAI Error: {e}")
+            yield f"Error generating response: {str(e)}"
+
+    async def generate_response_async(self, prompt: str) -> str:
+        # SDK/requests client is blocking, so run it in a worker thread
+        return await asyncio.to_thread(self.generate_response, prompt)
+
+    async def generate_batch_async(self, prompts: List[str]) -> List[str]:
+        """Generate responses for independent prompts concurrently"""
+        return await _gather_bounded(self.generate_response_async, prompts)
+
     def list_models(self):
         """List available models"""
         return [
@@ -91,13 +241,22 @@ class GPT4o:
 class GroqModel:
     """Groq model handler"""
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, http_client: Optional[httpx.Client] = None):
         self.logger = get_logger('groq')
         os.environ["GROQ_API_KEY"] = api_key
         try:
-            self.client = Groq()  # No arguments needed
+            # Groq speaks the OpenAI API, so reuse that SDK instead of a second HTTP stack
+            from openai import OpenAI
+            self.client = OpenAI(
+                api_key=api_key,
+                base_url=GROQ_BASE_URL,
+                http_client=http_client or shared_http_client()
+            )
             self.selected_model = "mixtral-8x7b-32768"
             self.system_prompt = load_system_prompt()
+            # Built once so every request shares the same system message
+            self._sys_msg = {"role": "system", "content": self.system_prompt}
+            self.temperature = None  # Provider default
         except Exception as e:
             self.logger.error(f"Groq Error: {e}")
             raise
@@ -110,24 +269,53 @@ class GroqModel:
             self.logger.error(f"Groq Error selecting model: {e}")
             return False
 
-    def generate_response(self, prompt: str) -> str:
-        try:
-            messages = [
-                {"role": "system", "content": self.system_prompt},
-                {"role": "user", "content": prompt}
-            ]
+    def _request_params(self, prompt: str) -> Dict:
+        messages = [
+            self._sys_msg,
+            {"role": "user", "content": prompt}
+        ]
+        params = {"model": self.selected_model, "messages": messages}
+        if self.temperature is not None:
+            params["temperature"] = self.temperature
+        return params
 
-            chat_completion = self.client.chat.completions.create(
-                messages=messages,
-                model=self.selected_model,
-            )
+    @cached_response
+    def _complete(self, prompt: str) -> str:
+        chat_completion = self.client.chat.completions.create(**self._request_params(prompt))
+        return chat_completion.choices[0].message.content
 
-            return chat_completion.choices[0].message.content
+    @cached_stream
+    def _stream(self, prompt: str) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            **self._request_params(prompt), stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
+    def generate_response(self, prompt: str) -> str:
+        try:
+            return self._complete(prompt)
         except Exception as e:
             self.logger.error(f"Groq Error: {e}")
             return f"Error generating response: {str(e)}"
 
+    def generate_response_stream(self, prompt: str) -> Iterator[str]:
+        """Yield the response incrementally as it is generated"""
+        try:
+            yield from self._stream(prompt)
+        except Exception as e:
+            self.logger.error(f"Groq Error: {e}")
+            yield f"Error generating response: {str(e)}"
+
+    async def generate_response_async(self, prompt: str) -> str:
+        # SDK/requests client is blocking, so run it in a worker thread
+        return await asyncio.to_thread(self.generate_response, prompt)
+
+    async def generate_batch_async(self, prompts: List[str]) -> List[str]:
+        """Generate responses for independent prompts concurrently"""
+        return await _gather_bounded(self.generate_response_async, prompts)
+
     def list_models(self):
         """List available models"""
         return [
@@ -150,7 +338,7 @@ class GroqModel:
 class TogetherModel:
     """Together AI model handler"""
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, http_client: Optional[httpx.AsyncClient] = None):
         self.logger = get_logger('together')
         self.api_key = api_key
         self.base_url = "https://api.together.xyz/v1"
@@ -159,7 +347,11 @@ class TogetherModel:
             "Content-Type": "application/json"
         }
         self.system_prompt = load_system_prompt()
+        # Built once so every request shares the same system message
+        self._sys_msg = {"role": "system", "content": self.system_prompt}
         self.selected_model = "mistralai/Mixtral-8x7B-Instruct-v0.1"
+        self.temperature = 0.7
+        self._aclient = http_client or shared_async_client()
 
     def select_model(self, model_id: str) -> bool:
         try:
@@ -170,37 +362,98 @@ class TogetherModel:
             self.logger.error(f"Together Error selecting model: {e}")
             return False
 
-    def generate_response(self, prompt: str) -> str:
-        try:
-            payload = {
-                "model": self.selected_model,
-                "messages": [
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                "max_tokens": 1000,
-                "temperature": 0.7
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=self.headers,
-                json=payload
-            )
+    def _payload(self, prompt: str) -> Dict:
+        return {
+            "model": self.selected_model,
+            "messages": [
+                self._sys_msg,
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": 1000,
+            "temperature": self.temperature
+        }
+
+    async def _post(self, payload: Dict, stream: bool = False) -> httpx.Response:
+        """POST a chat completion, retrying rate limits and server errors with backoff"""
+        request = self._aclient.build_request(
+            "POST", f"{self.base_url}/chat/completions",
+            headers=self.headers, content=ujson.dumps(payload)
+        )
+        for attempt in range(TOGETHER_MAX_RETRIES + 1):
+            response = await self._aclient.send(request, stream=stream)
+            if response.status_code not in RETRY_STATUSES or attempt == TOGETHER_MAX_RETRIES:
+                break
+            await response.aclose()
+            await asyncio.sleep(0.3 * 2 ** attempt)
+        if response.is_error:
+            await response.aclose()
             response.raise_for_status()
-            
+        return response
+
+    @cached_response
+    async def _complete_async(self, prompt: str) -> str:
+        response = await self._post(self._payload(prompt))
+
+        if self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug("Response generated", 
                             extra={'structured_data': {
                                 'model': self.selected_model,
-                                'status_code': response.status_code
+                                'status_code': response.status_code,
+                                'http_version': response.http_version
                             }})
-            
-            return response.json()["choices"][0]["message"]["content"]
-            
+        
+        return ujson.loads(response.content)["choices"][0]["message"]["content"]
+
+    async def _stream_async(self, prompt: str) -> AsyncIterator[str]:
+        payload = self._payload(prompt)
+        payload["stream"] = True
+        response = await self._post(payload, stream=True)
+        try:
+            # Server-sent events: one "data: {...}" frame per delta
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = ujson.loads(data).get("choices")
+                if choices:
+                    content = choices[0].get("delta", {}).get("content")
+                    if content:
+                        yield content
+        finally:
+            await response.aclose()
+
+    @cached_stream
+    def _stream(self, prompt: str) -> Iterator[str]:
+        yield from _iter_sync(self._stream_async(prompt))
+
+    def generate_response(self, prompt: str) -> str:
+        try:
+            return _run_sync(self.generate_response_async(prompt))
+        except Exception as e:
+            self.logger.error(f"Together Error: {e}")
+            return f"Error generating response: {str(e)}"
+
+    async def generate_response_async(self, prompt: str) -> str:
+        try:
+            return await self._complete_async(prompt)
         except Exception as e:
             self.logger.error(f"Together Error: {e}")
             return f"Error generating response: {str(e)}"
 
+    def generate_response_stream(self, prompt: str) -> Iterator[str]:
+        """Yield the response incrementally as it is generated"""
+        try:
+            yield from self._stream(prompt)
+        except Exception as e:
+            self.logger.error(f"Together Error: {e}")
+            yield f"Error generating response: {str(e)}"
+
+    async def generate_batch_async(self, prompts: List[str]) -> List[str]:
+        """Generate responses for independent prompts concurrently"""
+        return await _gather_bounded(self.generate_response_async, prompts)
+
     def list_models(self):
         """List available models"""
         return [
@@ -220,21 +473,73 @@ class TogetherModel:
             }
         ]
 
+# Ollama connection pools shared by every OllamaHandler; handlers keep only per-session state
+_ollama_http: Optional[requests.Session] = None
+_ollama_session: Optional[aiohttp.ClientSession] = None
+_ollama_session_lock: Optional[asyncio.Lock] = None
+
+def shared_ollama_http() -> requests.Session:
+    """Return the pooled sync session for the daemon's metadata endpoints"""
+    global _ollama_http
+    with _http_client_lock:
+        if _ollama_http is None:
+            _ollama_http = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64)
+            _ollama_http.mount("http://", adapter)
+            _ollama_http.mount("https://", adapter)
+    return _ollama_http
+
+async def _shared_ollama_session() -> aiohttp.ClientSession:
+    """Return the long-lived ClientSession, creating it inside the running loop"""
+    global _ollama_session, _ollama_session_lock
+    if _ollama_session is None or _ollama_session.closed:
+        if _ollama_session_lock is None:
+            _ollama_session_lock = asyncio.Lock()
+        async with _ollama_session_lock:
+            if _ollama_session is None or _ollama_session.closed:
+                _ollama_session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=256,
+                        limit_per_host=128,
+                        ttl_dns_cache=300,
+                        keepalive_timeout=75
+                    ),
+                    timeout=aiohttp.ClientTimeout(total=600),
+                    # Large read buffer avoids backpressure on long streamed replies
+                    read_bufsize=4 * 1024 * 1024,
+                    json_serialize=ujson.dumps
+                )
+    return _ollama_session
+
 class OllamaHandler:
     """Ollama local model handler"""
     
-    def __init__(self):
+    def __init__(self, available_models: Optional[List[str]] = None):
         self.logger = get_logger('ollama')
         self.selected_model = None
         self.last_error = None
         self.system_prompt = load_system_prompt()
+        # Built once so every request shares the same system message
+        self._sys_msg = {"role": "system", "content": self.system_prompt}
+        self.temperature = None  # Model default
+        self.base_url = OLLAMA_BASE_URL
+        self.http = shared_ollama_http()
+
+        # Installed models, fetched once unless supplied; use refresh_models() after pulling new ones
+        self.available_models: List[str] = (
+            list(available_models) if available_models is not None else self.list_models()
+        )
+
+    def _get_tags(self) -> Dict:
+        """Fetch locally installed models from the Ollama daemon"""
+        response = self.http.get(f"{self.base_url}/api/tags", timeout=5)
+        response.raise_for_status()
+        return ujson.loads(response.content)
 
     def check_installation(self) -> bool:
         try:
-            result = subprocess.run(['ollama', 'list'], 
-                                 capture_output=True, 
-                                 text=True)
-            return result.returncode == 0
+            self._get_tags()
+            return True
         except Exception as e:
             self.last_error = str(e)
             self.logger.error(f"Ollama installation check failed: {e}")
@@ -242,25 +547,25 @@ class OllamaHandler:
 
     def list_models(self) -> List[str]:
         try:
-            result = subprocess.run(['ollama', 'list'], 
-                                 capture_output=True, 
-                                 text=True)
-            if result.returncode == 0:
-                models = []
-                for line in result.stdout.split('\n')[1:]:  # Skip header
-                    if line.strip():
-                        models.append(line.split()[0])
-                return models
-            return []
+            return [model["name"] for model in self._get_tags().get("models", [])]
         except Exception as e:
             self.last_error = str(e)
             self.logger.error(f"Error listing Ollama models: {e}")
             return []
 
+    def refresh_models(self) -> List[str]:
+        """Re-query the daemon for installed models"""
+        self.available_models = self.list_models()
+        return self.available_models
+
     def select_model(self, model_name: str) -> bool:
         try:
-            if model_name in self.list_models():
+            # Only hit the daemon again if the model was pulled after startup
+            if model_name not in self.available_models:
+                self.refresh_models()
+            if model_name in self.available_models:
                 self.selected_model = model_name
+                self.last_error = None
                 self.logger.info(f"Model selected: {model_name}")
                 return True
             self.last_error = f"Model {model_name} not found"
@@ -275,32 +580,162 @@ class OllamaHandler:
             return "No model selected"
 
         try:
-            cmd = [
-                'ollama', 'run', 
-                self.selected_model, 
-                f"{self.system_prompt}\n\nUser: {prompt}\nAssistant:"
-            ]
-            
-            result = subprocess.run(cmd, 
-                                 capture_output=True, 
-                                 text=True)
-            
-            if result.returncode == 0:
-                response = result.stdout.strip()
-                self.logger.debug("Response generated", 
-                                extra={'structured_data': {
-                                    'model': self.selected_model,
-                                    'response_length': len(response)
-                                }})
-                return response
-            else:
-                self.last_error = result.stderr
-                return f"Error: {result.stderr}"
+            return _run_sync(self.generate_response_async(prompt))
+        except Exception as e:
+            self.last_error = str(e)
+            self.logger.error(f"Ollama Error: {e}")
+            return f"Error generating response: {str(e)}"
 
+    def _payload(self, prompt: str, stream: bool = False) -> Dict:
+        payload = {
+            "model": self.selected_model,
+            "messages": [
+                self._sys_msg,
+                {"role": "user", "content": prompt}
+            ],
+            "stream": stream
+        }
+        if self.temperature is not None:
+            payload["options"] = {"temperature": self.temperature}
+        return payload
+
+    @cached_response
+    async def _complete_async(self, prompt: str) -> str:
+        session = await _shared_ollama_session()
+        payload = self._payload(prompt)
+
+        async with session.post(f"{self.base_url}/api/chat", json=payload) as response:
+            response.raise_for_status()
+            data = ujson.loads(await response.read())
+
+        content = data["message"]["content"]
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Response generated", 
+                            extra={'structured_data': {
+                                'model': self.selected_model,
+                                'response_length': len(content)
+                            }})
+        return content
+
+    async def generate_response_async(self, prompt: str) -> str:
+        if not self.selected_model:
+            return "No model selected"
+
+        self.last_error = None
+        try:
+            return await self._complete_async(prompt)
         except Exception as e:
             self.last_error = str(e)
             self.logger.error(f"Ollama Error: {e}")
             return f"Error generating response: {str(e)}"
 
+    async def generate_batch_async(self, prompts: List[str]) -> List[str]:
+        """Generate responses for independent prompts concurrently"""
+        return await _gather_bounded(self.generate_response_async, prompts)
+
+    async def _stream_async(self, prompt: str) -> AsyncIterator[str]:
+        session = await _shared_ollama_session()
+        async with session.post(
+            f"{self.base_url}/api/chat", json=self._payload(prompt, stream=True)
+        ) as response:
+            response.raise_for_status()
+            # Newline-delimited JSON: one message fragment per line
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                data = ujson.loads(line)
+                content = data.get("message", {}).get("content")
+                if content:
+                    yield content
+                if data.get("done"):
+                    break
+
+    @cached_stream
+    def _stream(self, prompt: str) -> Iterator[str]:
+        yield from _iter_sync(self._stream_async(prompt))
+
+    def generate_response_stream(self, prompt: str) -> Iterator[str]:
+        """Yield the response incrementally as it is generated"""
+        if not self.selected_model:
+            yield "No model selected"
+            return
+
+        self.last_error = None
+        try:
+            yield from self._stream(prompt)
+        except Exception as e:
+            self.last_error = str(e)
+            self.logger.error(f"Ollama Error: {e}")
+            yield f"Error generating response: {str(e)}"
+
     def get_last_error(self) -> Optional[str]:
         return self.last_error
+
+async def _aclose_shared():
+    if _async_client is not None and not _async_client.is_closed:
+        await _async_client.aclose()
+    if _ollama_session is not None and not _ollama_session.closed:
+        await _ollama_session.close()
+
+def close_shared_clients():
+    """Close the process-wide HTTP pools; registered to run at interpreter exit"""
+    try:
+        if _http_client is not None:
+            _http_client.close()
+        if _ollama_http is not None:
+            _ollama_http.close()
+        # Async pools belong to the background loop; nothing to close if it never started
+        if _loop is not None and _loop.is_running():
+            _run_sync(_aclose_shared(), timeout=5)
+    except Exception as e:
+        logger.error(f"Error closing HTTP clients: {e}")
+
+atexit.register(close_shared_clients)
+
+async def agenerate(model, prompt: str) -> str:
+    """
+    Await a response from any handler without blocking the caller's event loop.
+    The call runs on the background loop, which owns the shared HTTP sessions.
+    """
+    future = asyncio.run_coroutine_threadsafe(model.generate_response_async(prompt), _get_loop())
+    return await asyncio.wrap_future(future)
+
+def generate_many(model, prompts: List[str]) -> List[str]:
+    """Run independent prompts concurrently from synchronous code, e.g. Streamlit"""
+    return _run_sync(model.generate_batch_async(prompts))
+
+# Provider name -> handler class, keyed by the names shown in the UI
+_PROVIDERS = {
+    "OpenAI": GPT4o,
+    "Together": TogetherModel,
+    "Groq": GroqModel,
+    "Ollama": OllamaHandler
+}
+
+# Hosted providers that cannot be constructed without an API key
+_NEEDS_KEY = frozenset({"OpenAI", "Together", "Groq"})
+
+def get_model_instance(provider: str, api_key: Optional[str] = None):
+    """Create the handler for a provider, or None if unknown or missing its key"""
+    cls = _PROVIDERS.get(provider)
+    if cls is None:
+        return None
+    if provider in _NEEDS_KEY:
+        return cls(api_key) if api_key else None
+    return cls()
+
+# Module exports
+__all__ = [
+    'GPT4o',
+    'GroqModel',
+    'TogetherModel',
+    'OllamaHandler',
+    'get_model_instance',
+    'shared_http_client',
+    'shared_async_client',
+    'shared_ollama_http',
+    'close_shared_clients',
+    'agenerate',
+    'generate_many',
+    'load_system_prompt'
+]
@@ -3,9 +3,23 @@
 import os
 import yaml
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 from logger import get_logger
 
+# libyaml-backed loader when available, pure-Python fallback otherwise
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_EMPTY = MappingProxyType({})
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
 class ModelConfig:
     _instance = None
     
@@ -22,27 +36,35 @@ class ModelConfig:
         self._initialized = True
         self.logger = get_logger('model_config')
         self.config_path = Path(__file__).parent / 'config.yaml'
-        self.models = self._load_config()
+        # Frozen all the way down so shared lookups cannot be mutated by callers.
+        # Proxies do not pickle: st.cache_data functions must return plain copies.
+        self.models = _freeze(self._load_config())
+        # Flattened (provider, model_id) index for single-lookup model info
+        self._model_index = MappingProxyType({
+            (provider, model_id): info
+            for provider, models in self.models.items()
+            for model_id, info in (models or _EMPTY).items()
+        })
 
     def _load_config(self) -> Dict:
         """Load model configuration from YAML"""
         try:
             with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YAML_LOADER) or {}
             self.logger.info("Model configuration loaded successfully")
-            return config
+            # Normalize provider keys once so lookups need no further casing work
+            return {provider.lower(): models for provider, models in config.items()}
         except Exception as e:
             self.logger.error(f"Error loading model configuration: {e}")
             return {}
 
-    def get_provider_models(self, provider: str) -> Dict:
+    def get_provider_models(self, provider: str) -> Mapping:
         """Get models for specific provider"""
-        return self.models.get(provider.lower(), {})
+        return self.models.get(provider.lower()) or _EMPTY
 
-    def get_model_info(self, provider: str, model_id: str) -> Optional[Dict]:
+    def get_model_info(self, provider: str, model_id: str) -> Optional[Mapping]:
         """Get specific model information"""
-        provider_models = self.get_provider_models(provider)
-        return provider_models.get(model_id)
+        return self._model_index.get((provider.lower(), model_id))
 
     def get_default_model(self, provider: str) -> Optional[str]:
         """Get default model for provider"""
@@ -55,11 +77,11 @@ class ModelConfig:
 model_config = ModelConfig()
 
 # Convenience functions
-def get_provider_models(provider: str) -> Dict:
+def get_provider_models(provider: str) -> Mapping:
     """Get models for specific provider"""
     return model_config.get_provider_models(provider)
 
-def get_model_info(provider: str, model_id: str) -> Optional[Dict]:
+def get_model_info(provider: str, model_id: str) -> Optional[Mapping]:
     """Get specific model info"""
     return model_config.get_model_info(provider, model_id)
 
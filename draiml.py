@@ -1,58 +1,97 @@
 # draiml.py (c) 2025 Gregory L. Magnusson MIT license
 
+import os
+import re
 import sys
+import secrets
+import hashlib
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 
 import streamlit as st
-import time
-from datetime import datetime
-from socratic import SocraticReasoning
-from chatter import GPT4o, GroqModel, TogetherModel, OllamaHandler
+from collections import deque
+from typing import Optional
+from chatter import OllamaHandler, get_model_instance
 from openmind import OpenMind
+from cache import semantic_cache
+from memory import ChatStore
 from config import model_config
 from logger import get_logger
 
 # Initialize logger
 logger = get_logger('draiml')
 
+# Basic styling used when styles.css cannot be read
+FALLBACK_CSS = """
+    <style>
+    .cost-tracker { padding: 10px; background: #f0f2f6; border-radius: 5px; }
+    .model-info { padding: 10px; background: #f0f2f6; border-radius: 5px; }
+    .capability-tag { 
+        display: inline-block; 
+        padding: 2px 8px; 
+        margin: 2px;
+        background: #e1e4e8; 
+        border-radius: 12px; 
+        font-size: 0.8em; 
+    }
+    .api-key-status {
+        display: flex;
+        align-items: center;
+        gap: 8px;
+        padding: 5px;
+        margin: 5px 0;
+    }
+    .checkmark {
+        color: #00c853;
+        font-weight: bold;
+    }
+    .msg { padding: 0.5rem 0.75rem; margin: 0.3rem 0; border-radius: 8px; }
+    .msg.user { background-color: #262730; }
+    .msg.assistant { background-color: #1E1E1E; }
+    </style>
+"""
+
+@st.cache_data
+def _load_text(path: str, mtime: float) -> str:
+    """Read a text file; keyed on mtime so edits invalidate the cache"""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
 # Load external CSS
 def load_css(css_file: str):
     try:
-        with open(css_file) as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+        css = _load_text(css_file, os.path.getmtime(css_file))
+        st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
     except Exception as e:
         logger.error(f"Error loading CSS: {e}")
         # Fallback basic styling
-        st.markdown("""
-            <style>
-            .cost-tracker { padding: 10px; background: #f0f2f6; border-radius: 5px; }
-            .model-info { padding: 10px; background: #f0f2f6; border-radius: 5px; }
-            .capability-tag { 
-                display: inline-block; 
-                padding: 2px 8px; 
-                margin: 2px;
-                background: #e1e4e8; 
-                border-radius: 12px; 
-                font-size: 0.8em; 
-            }
-            .api-key-status {
-                display: flex;
-                align-items: center;
-                gap: 8px;
-                padding: 5px;
-                margin: 5px 0;
-            }
-            .checkmark {
-                color: #00c853;
-                font-weight: bold;
-            }
-            </style>
-        """, unsafe_allow_html=True)
+        st.markdown(FALLBACK_CSS, unsafe_allow_html=True)
+
+# Provider selectbox options; None is the "nothing selected yet" placeholder
+PROVIDER_OPTIONS = (None, "OpenAI", "Together", "Groq", "Ollama")
+HOSTED_PROVIDERS = frozenset({"OpenAI", "Together", "Groq"})
+
+def _format_provider(provider: Optional[str]) -> str:
+    return "Select Provider" if provider is None else provider
+
+@st.cache_data(show_spinner=False)
+def _model_labels(provider: str) -> dict:
+    """Selectbox labels per model id, built once per provider"""
+    return {
+        model_id: f"{info['name']} ({info['cost']})"
+        for model_id, info in model_config.get_provider_models(provider).items()
+    }
+
+# Keep the transcript bounded; only the most recent turns are rendered expanded
+MAX_MESSAGES = 50
+RECENT_MESSAGES = 10
 
 # Initialize session state
 if "messages" not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = deque(maxlen=MAX_MESSAGES)
+if 'chat_store' not in st.session_state:
+    # Full transcript lives on disk; session_state only keeps the render window
+    st.session_state.chat_store = ChatStore(secrets.token_hex(8))
 if 'provider' not in st.session_state:
     st.session_state.provider = None
 if 'selected_model' not in st.session_state:
@@ -61,32 +100,94 @@ if 'model_capabilities' not in st.session_state:
     st.session_state.model_capabilities = []
 if 'cost_tracking' not in st.session_state:
     st.session_state.cost_tracking = {"total": 0.0, "session": 0.0}
+if 'model_handlers' not in st.session_state:
+    # provider -> (key fingerprint, handler); handlers carry this session's model choice
+    st.session_state.model_handlers = {}
 
-# Initialize model instances
-if 'model_instances' not in st.session_state:
-    st.session_state.model_instances = {
-        'ollama': None,
-        'groq': None,
-        'together': None,
-        'openai': None
-    }
+@st.cache_resource
+def get_openmind() -> OpenMind:
+    """Shared OpenMind instance, built once per process rather than per session"""
+    return OpenMind()
 
-if 'openmind' not in st.session_state:
-    st.session_state.openmind = OpenMind()
+@st.cache_resource
+def warm_semantic_cache() -> bool:
+    """Load the semantic cache's embedding model once per process, off the chat path"""
+    return semantic_cache.warm()
 
-def check_ollama_status():
-    """Check Ollama installation and available models"""
+def _session_handler(provider: str, api_key: str, factory):
+    """This session's handler for a provider, rebuilt only when its key changes.
+
+    Handlers hold per-session state (selected model), so they are never shared
+    across sessions; the HTTP connection pools underneath them are.
+    """
+    fingerprint = hashlib.sha256(api_key.encode()).hexdigest()
+    entry = st.session_state.model_handlers.get(provider)
+    if entry is None or entry[0] != fingerprint:
+        entry = (fingerprint, factory())
+        st.session_state.model_handlers[provider] = entry
+    return entry[1]
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_list_models() -> tuple:
+    """Installed Ollama models; the list rarely changes, so refresh at most every 30s"""
+    return tuple(OllamaHandler(available_models=()).refresh_models())
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _probe_ollama() -> tuple:
+    """Return (running, models), probing the daemon at most every 10s"""
     try:
-        if not st.session_state.model_instances['ollama']:
-            st.session_state.model_instances['ollama'] = OllamaHandler()
-        
-        if st.session_state.model_instances['ollama'].check_installation():
-            models = st.session_state.model_instances['ollama'].list_models()
-            return True, models
-        return False, []
+        if OllamaHandler(available_models=()).check_installation():
+            return True, cached_list_models()
+        return False, ()
     except Exception as e:
         logger.error(f"Error checking Ollama status: {e}")
-        return False, []
+        return False, ()
+
+def _refresh_ollama():
+    """Drop cached Ollama probes so the next run re-queries the daemon"""
+    _probe_ollama.clear()
+    cached_list_models.clear()
+
+def _init_hosted(provider: str):
+    """Return this session's client for a hosted provider, or None without a key"""
+    key = get_openmind().get_api_key(provider.lower())
+    if not key:
+        st.error(f"{provider} API key not found")
+        return None
+    try:
+        model = _session_handler(provider, key, lambda: get_model_instance(provider, key))
+    except Exception as e:
+        st.error(f"Error initializing {provider}: {str(e)}")
+        return None
+    if st.session_state.selected_model:
+        model.select_model(st.session_state.selected_model)
+    return model
+
+def _init_ollama(provider: str):
+    """Return this session's Ollama handler with its model selected"""
+    running, available_models = _probe_ollama()
+    if not running:
+        st.error("Ollama service is not running. Please start the Ollama service.")
+        return None
+    if not available_models:
+        st.error("No Ollama models found. Please pull a model first.")
+        return None
+    if not st.session_state.selected_model:
+        st.info("Please select an Ollama model to continue")
+        return None
+    ollama = _session_handler(provider, "", lambda: OllamaHandler(available_models))
+    if ollama.select_model(st.session_state.selected_model):
+        return ollama
+    st.error(ollama.get_last_error())
+    return None
+
+# Provider name -> initializer
+_MODEL_INITIALIZERS = {
+    "OpenAI": _init_hosted,
+    "Together": _init_hosted,
+    "Groq": _init_hosted,
+    "Ollama": _init_ollama
+}
 
 def initialize_model(provider: str):
     """Initialize or retrieve model instance"""
@@ -94,124 +195,136 @@ def initialize_model(provider: str):
         if not provider:
             st.info("Please select an AI Provider")
             return None
-        
-        if provider == "Together":
-            key = st.session_state.openmind.get_api_key('together')
-            if key:
-                if not st.session_state.model_instances['together']:
-                    instance = TogetherModel(key)
-                    st.session_state.model_instances['together'] = instance
-                return st.session_state.model_instances['together']
-            else:
-                st.error("Together API key not found")
-                return None
-                
-        elif provider == "Groq":
-            key = st.session_state.openmind.get_api_key('groq')
-            if key:
-                try:
-                    if not st.session_state.model_instances['groq']:
-                        st.session_state.model_instances['groq'] = GroqModel(key)
-                    return st.session_state.model_instances['groq']
-                except Exception as e:
-                    st.error(f"Error initializing Groq: {str(e)}")
-                    return None
-            else:
-                st.error("Groq API key not found")
-                return None
-                
-        elif provider == "OpenAI":
-            key = st.session_state.openmind.get_api_key('openai')
-            if key:
-                try:
-                    if not st.session_state.model_instances['openai']:
-                        st.session_state.model_instances['openai'] = GPT4o(key)
-                    return st.session_state.model_instances['openai']
-                except Exception as e:
-                    st.error(f"Error initializing OpenAI: {str(e)}")
-                    return None
-            else:
-                st.error("OpenAI API key not found")
-                return None
-                
-        elif provider == "Ollama":
-            if not st.session_state.model_instances['ollama']:
-                st.session_state.model_instances['ollama'] = OllamaHandler()
-                
-            if st.session_state.model_instances['ollama'].check_installation():
-                available_models = st.session_state.model_instances['ollama'].list_models()
-                if available_models:
-                    if not st.session_state.selected_model:
-                        st.info("Please select an Ollama model to continue")
-                        return None
-                    
-                    if st.session_state.model_instances['ollama'].select_model(st.session_state.selected_model):
-                        return st.session_state.model_instances['ollama']
-                    else:
-                        st.error(st.session_state.model_instances['ollama'].get_last_error())
-                        return None
-                else:
-                    st.error("No Ollama models found. Please pull a model first.")
-                    return None
-            else:
-                st.error("Ollama service is not running. Please start the Ollama service.")
-                return None
-                
-        return None
+
+        init = _MODEL_INITIALIZERS.get(provider)
+        return init(provider) if init else None
     except Exception as e:
         logger.error(f"Error initializing model: {e}")
         st.error(f"Error initializing model: {str(e)}")
         return None
 
-def update_cost_tracking(response_length: int):
-    """Update cost tracking based on current model and response length"""
+# Matches config cost strings such as "$0.03/1K tokens" or "$0.7/1M tokens"
+COST_PATTERN = re.compile(r'\$([\d.]+)/1([MK]) tokens')
+COST_UNITS = {"K": 1e3, "M": 1e6}
+
+@st.cache_data(show_spinner=False)
+def _rate_per_token(provider: str, model: str) -> float:
+    """Parse a model's configured cost into dollars per token, once per model"""
+    model_info = model_config.get_model_info(provider, model)
+    match = COST_PATTERN.search(model_info.get('cost', '')) if model_info else None
+    if not match:
+        return 0.0
+    return float(match.group(1)) / COST_UNITS[match.group(2)]
+
+@st.cache_resource(show_spinner=False)
+def _tokenizer(provider: str, model: str):
+    """tiktoken encoding for OpenAI models, or None to fall back to a length estimate"""
+    if provider != "openai":
+        return None
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+def count_tokens(provider: str, model: str, text: str) -> float:
+    """Token count from the model's tokenizer when available, else ~4 chars/token"""
+    encoding = _tokenizer(provider, model)
+    if encoding is None:
+        return len(text) / 4  # Approximate tokens
+    return len(encoding.encode(text))
+
+def update_cost_tracking(response: str):
+    """Update cost tracking based on current model and response text"""
     try:
         if st.session_state.provider and st.session_state.selected_model:
-            model_info = model_config.get_model_info(
-                st.session_state.provider.lower(),
-                st.session_state.selected_model
-            )
-            if model_info and 'cost' in model_info:
-                cost_str = model_info['cost']
-                if '/1M tokens' in cost_str:
-                    base_cost = float(cost_str.split('$')[1].split('/')[0])
-                    tokens = response_length / 4  # Approximate tokens
-                    cost = (tokens / 1000000) * base_cost
-                elif '/1K tokens' in cost_str:
-                    base_cost = float(cost_str.split('$')[1].split('/')[0])
-                    tokens = response_length / 4
-                    cost = (tokens / 1000) * base_cost
-                else:
-                    cost = 0.0
-                
-                st.session_state.cost_tracking["session"] += cost
-                st.session_state.cost_tracking["total"] += cost
+            provider = st.session_state.provider.lower()
+            model = st.session_state.selected_model
+            cost = count_tokens(provider, model, response) * _rate_per_token(provider, model)
+            st.session_state.cost_tracking["session"] += cost
+            st.session_state.cost_tracking["total"] += cost
     except Exception as e:
         logger.error(f"Error updating cost tracking: {e}")
 
-def display_model_info():
-    """Display current model information"""
-    try:
-        if st.session_state.provider and st.session_state.selected_model:
-            model_info = model_config.get_model_info(
-                st.session_state.provider.lower(),
-                st.session_state.selected_model
-            )
-            if model_info:
-                st.sidebar.markdown("### Model Information")
-                st.sidebar.markdown(f"""
+_CAP_TMPL = '<span class="capability-tag">{}</span>'.format
+
+@st.cache_data(show_spinner=False)
+def _render_model_info_html(provider: str, model: str) -> str:
+    """Build the sidebar model-info block once per (provider, model)"""
+    model_info = model_config.get_model_info(provider, model)
+    if not model_info:
+        return ""
+    return f"""
                 <div class="model-info">
                     <p><strong>Model:</strong> {model_info['name']}</p>
                     <p><strong>Developer:</strong> {model_info['developer']}</p>
                     <p><strong>Max Tokens:</strong> {model_info['tokens']}</p>
                     <p><strong>Cost:</strong> {model_info['cost']}</p>
                     <div><strong>Capabilities:</strong></div>
-                    {''.join([f'<span class="capability-tag">{cap}</span>' for cap in model_info.get('capabilities', [])])}
+                    {''.join(map(_CAP_TMPL, model_info.get('capabilities', ())))}
                 </div>
-                """, unsafe_allow_html=True)
+                """
+
+def display_model_info():
+    """Display current model information"""
+    try:
+        if st.session_state.provider and st.session_state.selected_model:
+            info_html = _render_model_info_html(
+                st.session_state.provider.lower(),
+                st.session_state.selected_model
+            )
+            if info_html:
+                st.markdown("### Model Information")
+                st.markdown(info_html, unsafe_allow_html=True)
     except Exception as e:
         logger.error(f"Error displaying model info: {e}")
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cleanup_chat_sessions() -> int:
+    """Drop transcripts of sessions idle for a day; runs at most once an hour"""
+    return ChatStore.cleanup_idle()
+
+def _record_message(role: str, content: str):
+    """Add a turn to the render window and the session's on-disk transcript"""
+    st.session_state.messages.append({"role": role, "content": content})
+    st.session_state.chat_store.append(role, content)
+
+def _clear_chat():
+    st.session_state.messages.clear()
+    st.session_state.chat_store.clear()
+
+def _render_history_markdown(messages) -> str:
+    """
+    Render earlier turns as one markdown block. Blank lines around each turn
+    let its markdown render inside the styled div; escaping "<" keeps reply
+    text from injecting HTML while leaving markdown syntax intact.
+    """
+    return "\n\n".join(
+        f'<div class="msg {message["role"]}">\n\n'
+        f'{message["content"].replace("<", "&lt;")}\n\n</div>'
+        for message in messages
+    )
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _has_api_key(provider: str) -> bool:
+    """Whether a key is stored; caches only the flag, never the secret itself"""
+    return bool(get_openmind().get_api_key(provider))
+
+def _save_api_key(provider: str):
+    """Form callback: persist the submitted key before the rerun renders the sidebar"""
+    api_key = st.session_state.get(f"{provider}_api_key")
+    if not api_key:
+        return
+    try:
+        get_openmind().save_api_key(provider, api_key)
+        _has_api_key.clear()
+    except Exception as e:
+        logger.error(f"Error saving API key: {e}")
+        st.error(f"Could not save {provider} API key: {str(e)}")
+
 def process_message(prompt):
     """Process and generate response to user message"""
     try:
@@ -223,38 +336,124 @@ def process_message(prompt):
         if not model:
             return
 
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        _record_message("user", prompt)
         
         with st.chat_message("user"):
             st.markdown(prompt)
 
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                try:
-                    response = model.generate_response(prompt)
-                    
-                    if st.session_state.provider == "Ollama" and model.get_last_error():
-                        st.error(model.get_last_error())
-                        return
-                    
-                    st.markdown(response)
-                    update_cost_tracking(len(response))
-                    
-                    st.session_state.messages.append({"role": "assistant", "content": response})
-                    
-                except Exception as e:
-                    logger.error(f"Error generating response: {e}")
-                    st.error(f"Error generating response: {str(e)}")
+            try:
+                # Render tokens as they arrive instead of waiting for the full reply
+                response = st.write_stream(model.generate_response_stream(prompt))
+                
+                if st.session_state.provider == "Ollama" and model.get_last_error():
+                    st.error(model.get_last_error())
+                    return
+                
+                update_cost_tracking(response)
+                
+                _record_message("assistant", response)
+                
+            except Exception as e:
+                logger.error(f"Error generating response: {e}")
+                st.error(f"Error generating response: {str(e)}")
     except Exception as e:
         logger.error(f"Error processing message: {e}")
         st.error("An error occurred while processing your message")
 
+@st.fragment
+def render_sidebar():
+    """Sidebar controls; widget changes here rerun only this fragment"""
+    try:
+        st.header("AI Configuration")
+        
+        # Check Ollama status
+        ollama_running, ollama_models = _probe_ollama()
+        if ollama_running:
+            st.markdown("""
+                <div class="api-key-status">
+                    <span class="checkmark">●</span>
+                    <span class="text">Ollama Running</span>
+                </div>
+                """, unsafe_allow_html=True)
+            if ollama_models:
+                st.caption(f"Available models: {', '.join(ollama_models)}")
+        st.button("Refresh models", on_click=_refresh_ollama, key="refresh_ollama")
+        
+        # Provider selection
+        previous_provider = st.session_state.provider
+        st.session_state.provider = st.selectbox(
+            "Select AI Provider", 
+            PROVIDER_OPTIONS,
+            format_func=_format_provider
+        )
+        
+        if previous_provider != st.session_state.provider:
+            st.session_state.selected_model = None
+            st.session_state.model_capabilities = []
+        
+        # Model selection based on provider
+        if st.session_state.provider:
+            if st.session_state.provider == "Ollama":
+                if ollama_models:
+                    st.session_state.selected_model = st.selectbox(
+                        "Select Ollama Model",
+                        options=ollama_models,
+                        key='ollama_model_select'
+                    )
+            else:
+                model_labels = _model_labels(st.session_state.provider.lower())
+                if model_labels:
+                    st.session_state.selected_model = st.selectbox(
+                        f"Select {st.session_state.provider} Model",
+                        options=list(model_labels),
+                        format_func=model_labels.__getitem__,
+                        key=f"{st.session_state.provider.lower()}_model_select"
+                    )
+                    
+                    # Display API key status and input
+                    if st.session_state.provider in HOSTED_PROVIDERS:
+                        # Show API key status
+                        if _has_api_key(st.session_state.provider.lower()):
+                            st.markdown(f"""
+                                <div class="api-key-status">
+                                    <span class="checkmark">✓</span>
+                                    <span class="text">{st.session_state.provider} API Key Stored</span>
+                                </div>
+                                """, unsafe_allow_html=True)
+                        
+                        # API key form: saved once per submit, not on every rerun
+                        with st.form(f"{st.session_state.provider.lower()}_key_form"):
+                            st.text_input(
+                                f"{st.session_state.provider} API Key",
+                                type="password",
+                                key=f"{st.session_state.provider.lower()}_api_key"
+                            )
+                            st.form_submit_button(
+                                "Save key",
+                                on_click=_save_api_key,
+                                args=(st.session_state.provider.lower(),)
+                            )
+        
+        # Display model information
+        display_model_info()
+
+        if st.button("Clear chat", key="clear_chat"):
+            _clear_chat()
+            # The transcript lives outside this fragment, so redraw the whole app
+            st.rerun()
+    except Exception as e:
+        logger.error(f"Error rendering sidebar: {e}")
+        st.error("An error occurred in the sidebar. Please try refreshing the page.")
+
 def main():
     try:
         st.title("drAIML - Medical AI Consultant")
         
         # Load CSS
         load_css('styles.css')
+        warm_semantic_cache()
+        _cleanup_chat_sessions()
         
         # Display cost tracker
         st.markdown(f"""
@@ -265,96 +464,27 @@ def main():
         """, unsafe_allow_html=True)
         
         with st.sidebar:
-            st.header("AI Configuration")
-            
-            # Check Ollama status
-            ollama_running, ollama_models = check_ollama_status()
-            if ollama_running:
-                st.markdown("""
-                    <div class="api-key-status">
-                        <span class="checkmark">●</span>
-                        <span class="text">Ollama Running</span>
-                    </div>
-                    """, unsafe_allow_html=True)
-                if ollama_models:
-                    st.caption(f"Available models: {', '.join(ollama_models)}")
-            
-            # Provider selection
-            previous_provider = st.session_state.provider
-            st.session_state.provider = st.selectbox(
-                "Select AI Provider", 
-                [None, "OpenAI", "Together", "Groq", "Ollama"],
-                format_func=lambda x: "Select Provider" if x is None else x
-            )
-            
-            if previous_provider != st.session_state.provider:
-                st.session_state.selected_model = None
-                st.session_state.model_capabilities = []
-            
-            # Model selection based on provider
-            if st.session_state.provider:
-                if st.session_state.provider == "Ollama":
-                    if ollama_models:
-                        st.session_state.selected_model = st.selectbox(
-                            "Select Ollama Model",
-                            options=ollama_models,
-                            key='ollama_model_select'
-                        )
-                else:
-                    provider_models = model_config.get_provider_models(st.session_state.provider.lower())
-                    if provider_models:
-                        st.session_state.selected_model = st.selectbox(
-                            f"Select {st.session_state.provider} Model",
-                            options=list(provider_models.keys()),
-                            format_func=lambda x: f"{provider_models[x]['name']} ({provider_models[x]['cost']})",
-                            key=f"{st.session_state.provider.lower()}_model_select"
-                        )
-                        
-                        # Display API key status and input
-                        if st.session_state.provider in ["OpenAI", "Together", "Groq"]:
-                            # Check if API key exists
-                            existing_key = st.session_state.openmind.get_api_key(
-                                st.session_state.provider.lower()
-                            )
-                            
-                            # Show API key status
-                            if existing_key:
-                                st.markdown(f"""
-                                    <div class="api-key-status">
-                                        <span class="checkmark">✓</span>
-                                        <span class="text">{st.session_state.provider} API Key Stored</span>
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                            
-                            # API key input
-                            api_key = st.text_input(
-                                f"{st.session_state.provider} API Key",
-                                type="password",
-                                key=f"{st.session_state.provider.lower()}_api_key"
-                            )
-                            
-                            if api_key:
-                                st.session_state.openmind.save_api_key(
-                                    st.session_state.provider.lower(), 
-                                    api_key
-                                )
-                                # Force refresh to show checkmark
-                                try:
-                                    st.rerun()  # Try new method first
-                                except AttributeError:
-                                    try:
-                                        st.experimental_rerun()  # Fall back to old method
-                                    except AttributeError:
-                                        st.empty()  # Final fallback
-            
-            # Display model information
-            display_model_info()
+            render_sidebar()
 
         # Chat interface
         chat_container = st.container()
         
         with chat_container:
-            for message in st.session_state.messages:
+            messages = list(st.session_state.messages)
+            older, recent = messages[:-RECENT_MESSAGES], messages[-RECENT_MESSAGES:]
+            # Turns that fell out of the in-memory window are only read back on request
+            archived = st.session_state.chat_store.count - len(messages)
+            if older or archived > 0:
+                with st.expander(f"Earlier messages ({len(older) + max(archived, 0)})"):
+                    if archived > 0 and st.button("Show earlier", key="show_earlier"):
+                        st.markdown(
+                            _render_history_markdown(st.session_state.chat_store.load(limit=archived)),
+                            unsafe_allow_html=True
+                        )
+                    if older:
+                        # One element for the whole backlog instead of two per message
+                        st.markdown(_render_history_markdown(older), unsafe_allow_html=True)
+            for message in recent:
                 with st.chat_message(message["role"]):
                     st.markdown(message["content"])
 
@@ -2,12 +2,154 @@
 
 import os
 import json
+import queue
+import atexit
+import time
+import threading
+from collections import deque
+from types import MappingProxyType
 from datetime import datetime
-from typing import Dict, List, Optional, Union, Any
+from typing import BinaryIO, Dict, List, Optional
 from logger import get_logger
-from memory import MedicalDecision, store_medical_decision
-from logic import LogicTables
-from medical_patterns import MedicalPatterns
+from medical_patterns import MedicalPatterns, KeywordScanner
+
+# Bound once; timestamps are taken several times per validation
+_now = datetime.now
+
+# orjson encodes straight to UTF-8 bytes several times faster than json
+try:
+    import orjson
+
+    def _dump_line(entry: Dict) -> bytes:
+        return orjson.dumps(
+            entry, default=str, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        )
+except ImportError:
+    def _dump_line(entry: Dict) -> bytes:
+        return (json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode('utf-8')
+
+class LogWriter:
+    """Appends JSON log entries as NDJSON lines from a background thread"""
+
+    def __init__(self,
+                 max_batch: int = 500,
+                 max_queue: int = 10000,
+                 buffer_size: int = 64 * 1024,
+                 fsync_every: int = 32,
+                 fsync_interval: float = 0.05):
+        self.logger = get_logger('hippocratic_principles')
+        self.max_batch = max_batch
+        self.buffer_size = buffer_size
+        # Group commit: one fsync per file covers up to fsync_every queued
+        # entries or fsync_interval seconds, whichever comes first
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        # Bounded: a stalled disk blocks writers instead of growing memory
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max_queue)
+        # Append handles stay open for the life of the writer
+        self._files: Dict[str, BinaryIO] = {}
+        # path -> (entries written since last fsync, monotonic time of the first)
+        self._unsynced: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        threading.Thread(target=self._worker, name="hippocratic-log-writer", daemon=True).start()
+        atexit.register(self.close)
+
+    def write(self, path: str, entry: Dict, sync: bool = False):
+        """
+        Append entry to path. Queued for the background thread by default;
+        sync writes and fsyncs before returning.
+        """
+        # Encoded here so later changes to the caller's dict cannot alter the line
+        try:
+            line = _dump_line(entry)
+        except (TypeError, ValueError) as e:
+            self.logger.error("Error encoding log entry for %s: %s", path, str(e))
+            return
+        if sync:
+            self._write(path, [line], durable=True)
+        else:
+            self._queue.put((path, line))
+
+    def flush(self):
+        """Block until every queued entry has been written"""
+        self._queue.join()
+
+    def close(self):
+        """Flush queued entries, fsync and close the open log files"""
+        self.flush()
+        with self._lock:
+            self._sync(force=True)
+            for f in self._files.values():
+                f.close()
+            self._files.clear()
+
+    def _write(self, path: str, lines: List[bytes], durable: bool = False):
+        """Append encoded lines to path with one buffered write"""
+        with self._lock:
+            try:
+                f = self._files.get(path)
+                if f is None:
+                    f = self._files[path] = open(path, 'ab', buffering=self.buffer_size)
+                f.writelines(lines)
+                f.flush()
+                count, since = self._unsynced.get(path, (0, time.monotonic()))
+                self._unsynced[path] = (count + len(lines), since)
+                if durable or count + len(lines) >= self.fsync_every:
+                    self._sync(path)
+            except Exception as e:
+                self.logger.error("Error writing log %s: %s", path, str(e))
+                # Reopen on the next write in case the file was moved
+                self._unsynced.pop(path, None)
+                stale = self._files.pop(path, None)
+                if stale is not None:
+                    try:
+                        stale.close()
+                    except Exception:
+                        pass
+
+    def _sync(self, path: Optional[str] = None, force: bool = False):
+        """fsync path, or every file past the interval (all when force); caller holds the lock"""
+        if path is not None:
+            os.fsync(self._files[path].fileno())
+            del self._unsynced[path]
+            return
+        deadline = time.monotonic() - self.fsync_interval
+        for pending, (_, since) in list(self._unsynced.items()):
+            if force or since <= deadline:
+                try:
+                    os.fsync(self._files[pending].fileno())
+                except Exception as e:
+                    self.logger.error("Error syncing log %s: %s", pending, str(e))
+                del self._unsynced[pending]
+
+    def _worker(self):
+        while True:
+            # Wake up after the interval while anything is waiting for fsync
+            try:
+                batch = [self._queue.get(timeout=self.fsync_interval if self._unsynced else None)]
+            except queue.Empty:
+                with self._lock:
+                    self._sync()
+                continue
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # One write per file per batch, lines kept in arrival order
+            by_path: Dict[str, List[bytes]] = {}
+            for path, line in batch:
+                by_path.setdefault(path, []).append(line)
+            for path, lines in by_path.items():
+                self._write(path, lines)
+            with self._lock:
+                self._sync()
+            for _ in batch:
+                self._queue.task_done()
+
+# Single writer so every instance appends to the shared log files in order
+log_writer = LogWriter()
 
 class HippocraticPrinciples:
     """Core principles based on the Hippocratic Oath and modern medical ethics"""
@@ -16,80 +158,96 @@ class HippocraticPrinciples:
         "do_no_harm": {
             "principle": "First, do no harm (primum non nocere)",
             "description": "Avoid causing harm to patients; every medical decision must first consider safety",
-            "validation_rules": [
+            "validation_rules": (
                 "Check for contraindications",
                 "Assess risk-benefit ratio",
                 "Consider alternative treatments",
                 "Evaluate potential side effects"
-            ]
+            )
         },
         "beneficence": {
             "principle": "Act in the best interest of the patient",
             "description": "Promote well-being and take positive steps to help patients",
-            "validation_rules": [
+            "validation_rules": (
                 "Ensure treatment benefits outweigh risks",
                 "Consider patient's quality of life",
                 "Provide evidence-based recommendations",
                 "Focus on patient wellness"
-            ]
+            )
         },
         "patient_autonomy": {
             "principle": "Respect patient's right to make decisions",
             "description": "Honor patient preferences and right to informed decision-making",
-            "validation_rules": [
+            "validation_rules": (
                 "Provide clear information",
                 "Respect patient choices",
                 "Ensure informed consent",
                 "Protect patient rights"
-            ]
+            )
         },
         "justice": {
             "principle": "Treat all patients fairly and equally",
             "description": "Ensure fair distribution of benefits and risks",
-            "validation_rules": [
+            "validation_rules": (
                 "Avoid discrimination",
                 "Ensure equal access",
                 "Consider resource allocation",
                 "Maintain professional standards"
-            ]
+            )
         },
         "confidentiality": {
             "principle": "Protect patient privacy and information",
             "description": "Maintain strict confidentiality of patient information",
-            "validation_rules": [
+            "validation_rules": (
                 "Protect patient data",
                 "Secure communications",
                 "Limit information sharing",
                 "Maintain records securely"
-            ]
+            )
         },
         "informed_consent": {
             "principle": "Ensure patient understanding and agreement",
             "description": "Obtain informed consent for all medical decisions",
-            "validation_rules": [
+            "validation_rules": (
                 "Explain procedures clearly",
                 "Document consent",
                 "Verify understanding",
                 "Allow questions"
-            ]
+            )
         },
         "professional_ethics": {
             "principle": "Maintain professional standards and ethics",
             "description": "Uphold medical professional standards and ethical conduct",
-            "validation_rules": [
+            "validation_rules": (
                 "Follow medical guidelines",
                 "Maintain competence",
                 "Collaborate appropriately",
                 "Document decisions"
-            ]
+            )
         }
     }
 
-    EMERGENCY_KEYWORDS = [
+    EMERGENCY_KEYWORDS = (
         "heart attack", "stroke", "bleeding", "unconscious", "breathing difficulty",
         "severe pain", "chest pain", "head injury", "seizure", "anaphylaxis",
         "suicide", "overdose", "emergency", "critical", "severe", "urgent"
-    ]
+    )
+
+    # Built once; scans lowercased text for the keywords above
+    EMERGENCY_SCANNER = KeywordScanner(EMERGENCY_KEYWORDS)
+
+    # In-memory validation entries kept per instance
+    HISTORY_SIZE = 1024
+
+    # Risk levels that call for immediate attention
+    HIGH_RISK_LEVELS = frozenset(("high", "critical"))
+
+    # Appended to every set of validation recommendations
+    GENERAL_RECOMMENDATIONS = (
+        "Document all medical observations",
+        "Monitor for changes in symptoms",
+        "Keep medical records updated"
+    )
 
     RISK_LEVELS = {
         "low": {
@@ -130,6 +288,15 @@ class HippocraticPrinciples:
         }
     }
 
+    # Flat read-only lookups for the validation hot path
+    PRINCIPLE_RULES = MappingProxyType({
+        name: config["validation_rules"] for name, config in PRINCIPLES.items()
+    })
+    VALIDATION_CONFIG = MappingProxyType({
+        level: (tuple(config["checks"]), config["required_score"])
+        for level, config in VALIDATION_LEVELS.items()
+    })
+
     DISCLAIMER = """
     IMPORTANT MEDICAL DISCLAIMER:
     This is AI-assisted medical information. Always consult with qualified 
@@ -150,17 +317,19 @@ class HippocraticPrinciples:
 
     def __init__(self):
         self.logger = get_logger('hippocratic_principles')
-        self.validation_history = []
+        # Recent entries only; the full history is in the validation log file
+        self.validation_history = deque(maxlen=self.HISTORY_SIZE)
+        self._writer = log_writer
         self._initialize_logging()
 
     def _initialize_logging(self):
         """Initialize logging for principle applications"""
         try:
             self.log_paths = {
-                'principle_applications': './memory/logs/hippocratic/principles.json',
-                'validation_history': './memory/logs/hippocratic/validation.json',
-                'ethical_decisions': './memory/logs/hippocratic/decisions.json',
-                'emergency_logs': './memory/logs/hippocratic/emergency.json'
+                'principle_applications': './memory/logs/hippocratic/principles.jsonl',
+                'validation_history': './memory/logs/hippocratic/validation.jsonl',
+                'ethical_decisions': './memory/logs/hippocratic/decisions.jsonl',
+                'emergency_logs': './memory/logs/hippocratic/emergency.jsonl'
             }
 
             # Create log directories
@@ -172,31 +341,34 @@ class HippocraticPrinciples:
                                'log_paths': self.log_paths
                            }})
         except Exception as e:
-            self.logger.error(f"Error initializing Hippocratic logging: {e}")
+            self.logger.error("Error initializing Hippocratic logging: %s", str(e))
             raise
 
-    def log_principle_application(self, principle: str, context: Dict):
+    def log_principle_application(self, 
+                                  principle: str, 
+                                  context: Dict, 
+                                  timestamp: Optional[str] = None):
         """Log application of Hippocratic principle"""
         try:
             entry = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp or _now().isoformat(),
                 "principle": principle,
                 "context": context,
-                "validation_rules_applied": self.PRINCIPLES[principle]["validation_rules"]
+                "validation_rules_applied": self.PRINCIPLE_RULES[principle]
             }
 
             self._append_to_log('principle_applications', entry)
             
-            self.logger.info(f"Principle applied: {principle}", 
+            self.logger.info("Principle applied: %s", principle, 
                            extra={'structured_data': entry})
         except Exception as e:
-            self.logger.error(f"Error logging principle application: {e}")
+            self.logger.error("Error logging principle application: %s", str(e))
 
-    def log_validation(self, validation_result: Dict):
+    def log_validation(self, validation_result: Dict, timestamp: Optional[str] = None):
         """Log validation result"""
         try:
             entry = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp or _now().isoformat(),
                 "validation_result": validation_result,
                 "principles_checked": validation_result.get("principles_checked", []),
                 "validation_level": validation_result.get("validation_level", "basic")
@@ -208,18 +380,17 @@ class HippocraticPrinciples:
             self.logger.info("Validation logged", 
                            extra={'structured_data': entry})
         except Exception as e:
-            self.logger.error(f"Error logging validation: {e}")
+            self.logger.error("Error logging validation: %s", str(e))
 
-    def log_emergency(self, context: Dict):
+    def log_emergency(self, context: Dict, timestamp: Optional[str] = None):
         """Log emergency situation"""
         try:
             entry = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp or _now().isoformat(),
                 "emergency_context": context,
-                "keywords_detected": [
-                    kw for kw in self.EMERGENCY_KEYWORDS 
-                    if kw in context.get("text", "").lower()
-                ],
+                "keywords_detected": self.EMERGENCY_SCANNER.findall(
+                    context.get("text", "").lower()
+                ),
                 "risk_level": "critical"
             }
 
@@ -228,42 +399,96 @@ class HippocraticPrinciples:
             self.logger.critical("Emergency situation logged", 
                                extra={'structured_data': entry})
         except Exception as e:
-            self.logger.error(f"Error logging emergency: {e}")
+            self.logger.error("Error logging emergency: %s", str(e))
 
     def _append_to_log(self, log_type: str, entry: Dict):
-        """Append entry to specified log file"""
+        """Append entry to specified log file (one JSON object per line)"""
         try:
-            log_path = self.log_paths[log_type]
-            
-            try:
-                with open(log_path, 'r') as f:
-                    logs = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError):
-                logs = []
-
-            logs.append(entry)
-
-            with open(log_path, 'w') as f:
-                json.dump(logs, f, indent=2)
-                
+            # Emergencies reach disk before the caller continues
+            self._writer.write(
+                self.log_paths[log_type], entry, sync=log_type == 'emergency_logs'
+            )
         except Exception as e:
-            self.logger.error(f"Error appending to log {log_type}: {e}")
+            self.logger.error("Error appending to log %s: %s", log_type, str(e))
+
+    def flush(self):
+        """Wait for queued log entries to reach disk"""
+        self._writer.flush()
             
+def _pattern_scanners() -> tuple:
+    """
+    Flatten the MedicalPatterns tables into (bucket, labels, field, scanner)
+    rows in extraction order, so matching needs no nested dict walks
+    """
+    rows = []
+    for category, subcategories in MedicalPatterns.SYMPTOM_PATTERNS.items():
+        for subcategory, terms in subcategories.items():
+            rows.append(("symptoms", {"category": category, "subcategory": subcategory},
+                         "terms", KeywordScanner(terms)))
+    for category, indicators in MedicalPatterns.CONDITION_INDICATORS.items():
+        rows.append(("conditions", {"category": category}, "indicators", KeywordScanner(indicators)))
+    for category, terms in MedicalPatterns.TREATMENT_PATTERNS.items():
+        rows.append(("treatments", {"category": category}, "terms", KeywordScanner(terms)))
+    for category, factors in MedicalPatterns.RISK_FACTORS.items():
+        rows.append(("risk_factors", {"category": category}, "factors", KeywordScanner(factors)))
+    return tuple(rows)
+
+# Rule scorers; each takes the validation context and returns a score
+def _score_contraindications(context: Dict) -> float:
+    return 0.8 if context["medical_patterns"]["risk_factors"] else 1.0
+
+def _score_risk(context: Dict) -> float:
+    return 0.6 if context["risk_assessment"]["level"] in HippocraticPrinciples.HIGH_RISK_LEVELS else 1.0
+
+def _score_documentation(context: Dict) -> float:
+    return 1.0 if context.get("context") else 0.8
+
+def _score_default(context: Dict) -> float:
+    return 1.0
+
+# First keyword found in the lowercased rule text picks the scorer
+RULE_SCORERS = (
+    ("contraindications", _score_contraindications),
+    ("risk", _score_risk),
+    ("document", _score_documentation)
+)
+
+def _rule_scorer(rule: str):
+    """Resolve the scorer for a validation rule by its keywords"""
+    rule_lower = rule.lower()
+    for keyword, scorer in RULE_SCORERS:
+        if keyword in rule_lower:
+            return scorer
+    return _score_default
+
 class HippocraticReasoning:
     """Medical ethics reasoning and validation system"""
     
+    # Keyword scanners built once at import
+    PATTERN_SCANNERS = _pattern_scanners()
+    SEVERE_SCANNER = KeywordScanner(MedicalPatterns.SYMPTOM_PATTERNS["severity"]["severe"])
+    MODERATE_SCANNER = KeywordScanner(MedicalPatterns.SYMPTOM_PATTERNS["severity"]["moderate"])
+    
+    # Scorer for every known rule, resolved once at import
+    RULE_DISPATCH = MappingProxyType({
+        rule: _rule_scorer(rule)
+        for rules in HippocraticPrinciples.PRINCIPLE_RULES.values()
+        for rule in rules
+    })
+    
     def __init__(self):
         self.logger = get_logger('hippocratic_reasoning')
         self.principles = HippocraticPrinciples()
-        self.logic_tables = LogicTables()
         self.medical_patterns = MedicalPatterns()
         
         # Initialize validation tracking
         self.current_session = {
-            "session_id": datetime.now().strftime("%Y%m%d_%H%M%S"),
+            "session_id": _now().strftime("%Y%m%d_%H%M%S"),
             "validations_performed": 0,
             "emergency_situations": 0,
-            "ethical_conflicts": []
+            # Most recent conflicts only; the count covers the whole session
+            "ethical_conflicts": deque(maxlen=HippocraticPrinciples.HISTORY_SIZE),
+            "ethical_conflict_count": 0
         }
         
         self.logger.info("Hippocratic Reasoning initialized", 
@@ -281,34 +506,42 @@ class HippocraticReasoning:
         Validate medical response against Hippocratic principles
         """
         try:
-            validation_start = datetime.now()
+            # One wall-clock timestamp for the result and every log entry it
+            # produces; the duration comes from the monotonic clock
+            validation_start = time.perf_counter()
+            timestamp = _now().isoformat()
             
+            # Lowercase once; every keyword scan below works on this copy
+            response_lower = response.lower()
+
             # Check for emergencies first
-            is_emergency = self._check_emergency_situation(response, context)
+            is_emergency = self._check_emergency_situation(response_lower, context, timestamp)
             if is_emergency:
-                return self._handle_emergency_response(response, context)
+                return self._handle_emergency_response(response, context, timestamp)
 
-            # Prepare validation context
+            # Prepare validation context; the critical keyword scan is only
+            # skipped when the emergency check finished scanning the response
             validation_context = self._prepare_validation_context(
-                response, context, provider, model
+                response, response_lower, context, provider, model,
+                emergency_checked=is_emergency is not None
             )
 
             # Perform validation checks
             validation_result = self._perform_validation_checks(
-                validation_context, validation_level
+                validation_context, validation_level, timestamp
             )
 
             # Add response metadata
             validation_result.update({
-                "timestamp": datetime.now().isoformat(),
-                "validation_duration": (datetime.now() - validation_start).total_seconds(),
+                "timestamp": timestamp,
+                "validation_duration": time.perf_counter() - validation_start,
                 "provider": provider,
                 "model": model,
                 "session_id": self.current_session["session_id"]
             })
 
             # Log validation
-            self.principles.log_validation(validation_result)
+            self.principles.log_validation(validation_result, timestamp)
             self.current_session["validations_performed"] += 1
 
             return validation_result
@@ -323,25 +556,34 @@ class HippocraticReasoning:
             return {
                 "is_valid": False,
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now().isoformat()
             }
 
-    def _check_emergency_situation(self, response: str, context: Dict) -> bool:
-        """Check if situation requires emergency response"""
+    def _check_emergency_situation(self, 
+                                   response_lower: str, 
+                                   context: Dict, 
+                                   timestamp: Optional[str] = None) -> Optional[bool]:
+        """
+        Check if situation requires emergency response. Returns None when the
+        response itself could not be scanned, so callers must not treat the
+        emergency keywords as ruled out.
+        """
+        response_hit = None
         try:
-            # Check response and context for emergency keywords
-            combined_text = f"{response} {json.dumps(context)}".lower()
-            
-            emergency_detected = any(
-                keyword in combined_text 
-                for keyword in self.principles.EMERGENCY_KEYWORDS
-            )
+            # Scan the response before serializing the context, so a context
+            # json cannot encode never hides an emergency in the response. A
+            # hit in the response skips the context scan; no keyword can span
+            # the joining space since serialized JSON never starts with one.
+            scanner = self.principles.EMERGENCY_SCANNER
+            response_hit = scanner.search(response_lower)
+            context_text = json.dumps(context, default=str).lower()
+            emergency_detected = response_hit or scanner.search(context_text)
 
             if emergency_detected:
                 self.principles.log_emergency({
-                    "text": combined_text,
+                    "text": f"{response_lower} {context_text}",
                     "context": context
-                })
+                }, timestamp)
                 self.current_session["emergency_situations"] += 1
 
             return emergency_detected
@@ -349,9 +591,12 @@ class HippocraticReasoning:
         except Exception as e:
             self.logger.error("Emergency check error", 
                             extra={'structured_data': {'error': str(e)}})
-            return False
+            return response_hit
 
-    def _handle_emergency_response(self, response: str, context: Dict) -> Dict:
+    def _handle_emergency_response(self, 
+                                   response: str, 
+                                   context: Dict, 
+                                   timestamp: Optional[str] = None) -> Dict:
         """Generate appropriate response for emergency situation"""
         emergency_response = {
             "is_valid": False,
@@ -363,7 +608,7 @@ class HippocraticReasoning:
                 "Do not rely on AI guidance in emergencies"
             ],
             "original_response": response,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp or _now().isoformat()
         }
 
         self.logger.critical("Emergency response generated", 
@@ -372,21 +617,26 @@ class HippocraticReasoning:
 
     def _prepare_validation_context(self, 
                                   response: str, 
+                                  response_lower: str, 
                                   context: Dict, 
                                   provider: str, 
-                                  model: str) -> Dict:
+                                  model: str,
+                                  emergency_checked: bool = False) -> Dict:
         """Prepare context for validation"""
+        patterns = self._extract_medical_patterns(response_lower)
         return {
             "response": response,
             "context": context,
             "provider": provider,
             "model": model,
-            "medical_patterns": self._extract_medical_patterns(response),
-            "risk_assessment": self._assess_risk_level(response, context)
+            "medical_patterns": patterns,
+            "risk_assessment": self._assess_risk_level(
+                response_lower, context, emergency_checked=emergency_checked, patterns=patterns
+            )
         }
 
-    def _extract_medical_patterns(self, text: str) -> Dict:
-        """Extract medical patterns from text"""
+    def _extract_medical_patterns(self, text_lower: str) -> Dict:
+        """Extract medical patterns from already lowercased text"""
         patterns = {
             "symptoms": [],
             "conditions": [],
@@ -395,43 +645,10 @@ class HippocraticReasoning:
         }
 
         try:
-            # Extract symptoms
-            for category, symptom_patterns in self.medical_patterns.SYMPTOM_PATTERNS.items():
-                for subcategory, terms in symptom_patterns.items():
-                    matches = [term for term in terms if term in text.lower()]
-                    if matches:
-                        patterns["symptoms"].append({
-                            "category": category,
-                            "subcategory": subcategory,
-                            "terms": matches
-                        })
-
-            # Extract conditions
-            for category, indicators in self.medical_patterns.CONDITION_INDICATORS.items():
-                matches = [ind for ind in indicators if ind in text.lower()]
-                if matches:
-                    patterns["conditions"].append({
-                        "category": category,
-                        "indicators": matches
-                    })
-
-            # Extract treatments
-            for category, terms in self.medical_patterns.TREATMENT_PATTERNS.items():
-                matches = [term for term in terms if term in text.lower()]
+            for bucket, labels, field, scanner in self.PATTERN_SCANNERS:
+                matches = scanner.findall(text_lower)
                 if matches:
-                    patterns["treatments"].append({
-                        "category": category,
-                        "terms": matches
-                    })
-
-            # Extract risk factors
-            for category, factors in self.medical_patterns.RISK_FACTORS.items():
-                matches = [factor for factor in factors if factor in text.lower()]
-                if matches:
-                    patterns["risk_factors"].append({
-                        "category": category,
-                        "factors": matches
-                    })
+                    patterns[bucket].append({**labels, field: matches})
 
             return patterns
 
@@ -440,8 +657,17 @@ class HippocraticReasoning:
                             extra={'structured_data': {'error': str(e)}})
             return patterns
 
-    def _assess_risk_level(self, response: str, context: Dict) -> Dict:
-        """Assess risk level of medical situation"""
+    def _assess_risk_level(self, 
+                           response_lower: str, 
+                           context: Dict, 
+                           emergency_checked: bool = False,
+                           patterns: Dict = None) -> Dict:
+        """
+        Assess risk level of medical situation from already lowercased text.
+        emergency_checked skips the critical keyword scan when the caller has
+        already ruled out every emergency keyword; patterns reuses a result
+        of _extract_medical_patterns for the same text.
+        """
         try:
             risk_assessment = {
                 "level": "low",
@@ -451,11 +677,8 @@ class HippocraticReasoning:
             }
 
             # Check for critical indicators
-            critical_indicators = set(self.principles.EMERGENCY_KEYWORDS)
-            found_indicators = [
-                indicator for indicator in critical_indicators 
-                if indicator in response.lower()
-            ]
+            found_indicators = [] if emergency_checked else \
+                self.principles.EMERGENCY_SCANNER.findall(response_lower)
 
             if found_indicators:
                 risk_assessment.update({
@@ -467,18 +690,18 @@ class HippocraticReasoning:
                 return risk_assessment
 
             # Assess severity patterns
-            severity_patterns = self.medical_patterns.SYMPTOM_PATTERNS["severity"]
-            
-            if any(term in response.lower() for term in severity_patterns["severe"]):
+            if self.SEVERE_SCANNER.search(response_lower):
                 risk_assessment["level"] = "high"
                 risk_assessment["requires_monitoring"] = True
                 risk_assessment["requires_immediate_action"] = True
-            elif any(term in response.lower() for term in severity_patterns["moderate"]):
+            elif self.MODERATE_SCANNER.search(response_lower):
                 risk_assessment["level"] = "moderate"
                 risk_assessment["requires_monitoring"] = True
 
             # Add risk factors
-            risk_factors = self._extract_medical_patterns(response)["risk_factors"]
+            if patterns is None:
+                patterns = self._extract_medical_patterns(response_lower)
+            risk_factors = patterns["risk_factors"]
             if risk_factors:
                 risk_assessment["factors"].extend([
                     f"{factor['category']}: {', '.join(factor['factors'])}"
@@ -494,36 +717,50 @@ class HippocraticReasoning:
 
     def _perform_validation_checks(self, 
                                  validation_context: Dict, 
-                                 validation_level: str) -> Dict:
+                                 validation_level: str,
+                                 timestamp: Optional[str] = None) -> Dict:
         """Perform validation checks based on Hippocratic principles"""
         try:
-            validation_config = self.principles.VALIDATION_LEVELS[validation_level]
-            principles_to_check = validation_config["checks"]
-            required_score = validation_config["required_score"]
+            principles_to_check, required_score = \
+                self.principles.VALIDATION_CONFIG[validation_level]
 
             validation_results = []
             ethical_conflicts = []
+            total = len(principles_to_check)
+            score_sum = 0
 
-            for principle in principles_to_check:
+            for index, principle in enumerate(principles_to_check, 1):
                 principle_result = self._validate_principle(
-                    principle, validation_context
+                    principle, validation_context, timestamp
                 )
                 validation_results.append(principle_result)
+                score_sum += principle_result["score"]
                 
                 if not principle_result["passed"] and principle_result.get("ethical_conflict"):
                     ethical_conflicts.append(principle_result["ethical_conflict"])
 
-            # Calculate overall validation score
-            total_score = sum(r["score"] for r in validation_results) / len(validation_results)
+                # Stop once perfect scores on the remaining principles could
+                # no longer lift the average to the required score
+                if (score_sum + total - index) / total < required_score - 1e-9:
+                    break
+
+            not_evaluated = list(principles_to_check[len(validation_results):])
+
+            # Averaged over every principle in the level, as before the early
+            # exit; unevaluated principles add nothing, so a result cut short
+            # never scores above the complete one
+            total_score = score_sum / total
             
-            validation_passed = total_score >= required_score and not ethical_conflicts
+            validation_passed = (not not_evaluated and 
+                                 total_score >= required_score and 
+                                 not ethical_conflicts)
 
             result = {
                 "is_valid": validation_passed,
                 "validation_level": validation_level,
                 "overall_score": total_score,
                 "required_score": required_score,
-                "principles_checked": principles_to_check,
+                "principles_checked": list(principles_to_check),
                 "principle_results": validation_results,
                 "ethical_conflicts": ethical_conflicts,
                 "recommendations": self._generate_recommendations(
@@ -531,8 +768,12 @@ class HippocraticReasoning:
                 )
             }
 
+            if not_evaluated:
+                result["principles_not_evaluated"] = not_evaluated
+
             if ethical_conflicts:
                 self.current_session["ethical_conflicts"].extend(ethical_conflicts)
+                self.current_session["ethical_conflict_count"] += len(ethical_conflicts)
 
             return result
 
@@ -545,11 +786,13 @@ class HippocraticReasoning:
                 "validation_level": validation_level
             }
 
-    def _validate_principle(self, principle: str, context: Dict) -> Dict:
+    def _validate_principle(self, 
+                            principle: str, 
+                            context: Dict, 
+                            timestamp: Optional[str] = None) -> Dict:
         """Validate response against a specific Hippocratic principle"""
         try:
-            principle_config = self.principles.PRINCIPLES[principle]
-            validation_rules = principle_config["validation_rules"]
+            validation_rules = self.principles.PRINCIPLE_RULES[principle]
             
             rule_results = []
             for rule in validation_rules:
@@ -570,7 +813,7 @@ class HippocraticReasoning:
             if not passed:
                 result["ethical_conflict"] = {
                     "principle": principle,
-                    "description": principle_config["description"],
+                    "description": self.principles.PRINCIPLES[principle]["description"],
                     "violated_rules": [
                         r["rule"] for r in rule_results if not r["passed"]
                     ]
@@ -580,12 +823,12 @@ class HippocraticReasoning:
             self.principles.log_principle_application(principle, {
                 "validation_result": result,
                 "context": context
-            })
+            }, timestamp)
 
             return result
 
         except Exception as e:
-            self.logger.error(f"Error validating principle {principle}", 
+            self.logger.error("Error validating principle %s", principle, 
                             extra={'structured_data': {'error': str(e)}})
             return {
                 "principle": principle,
@@ -596,32 +839,20 @@ class HippocraticReasoning:
     def _check_validation_rule(self, rule: str, context: Dict) -> Dict:
         """Check a specific validation rule"""
         try:
-            # Rule-specific validation logic
-            response_text = context["response"].lower()
-            patterns = context["medical_patterns"]
-            risk_assessment = context["risk_assessment"]
+            # Rule-specific score; rules outside PRINCIPLES resolve on the fly
+            scorer = self.RULE_DISPATCH.get(rule) or _rule_scorer(rule)
+            score = scorer(context)
 
-            rule_result = {
+            # Built once the score is known instead of filled in and patched
+            return {
                 "rule": rule,
-                "passed": True,
-                "score": 1.0,
+                "passed": score >= 0.7,
+                "score": score,
                 "details": []
             }
 
-            # Adjust score based on context
-            if "contraindications" in rule.lower():
-                rule_result["score"] = 0.8 if patterns["risk_factors"] else 1.0
-            elif "risk" in rule.lower():
-                rule_result["score"] = 0.6 if risk_assessment["level"] in ["high", "critical"] else 1.0
-            elif "document" in rule.lower():
-                rule_result["score"] = 1.0 if context.get("context") else 0.8
-
-            rule_result["passed"] = rule_result["score"] >= 0.7
-
-            return rule_result
-
         except Exception as e:
-            self.logger.error(f"Error checking validation rule: {rule}", 
+            self.logger.error("Error checking validation rule: %s", rule, 
                             extra={'structured_data': {'error': str(e)}})
             return {
                 "rule": rule,
@@ -639,7 +870,7 @@ class HippocraticReasoning:
             
             # Add recommendations based on risk level
             risk_level = context["risk_assessment"]["level"]
-            if risk_level in ["high", "critical"]:
+            if risk_level in self.principles.HIGH_RISK_LEVELS:
                 recommendations.append(
                     "Seek immediate professional medical attention"
                 )
@@ -658,11 +889,7 @@ class HippocraticReasoning:
                     )
 
             # Add general recommendations
-            recommendations.extend([
-                "Document all medical observations",
-                "Monitor for changes in symptoms",
-                "Keep medical records updated"
-            ])
+            recommendations.extend(self.principles.GENERAL_RECOMMENDATIONS)
 
             return recommendations
 
@@ -678,8 +905,8 @@ class HippocraticReasoning:
                 "session_id": self.current_session["session_id"],
                 "validations_performed": self.current_session["validations_performed"],
                 "emergency_situations": self.current_session["emergency_situations"],
-                "ethical_conflicts": len(self.current_session["ethical_conflicts"]),
-                "timestamp": datetime.now().isoformat()
+                "ethical_conflicts": self.current_session["ethical_conflict_count"],
+                "timestamp": _now().isoformat()
             }
         except Exception as e:
             self.logger.error("Error getting session statistics", 
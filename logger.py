@@ -237,8 +237,11 @@ class DrAIMLLogger:
         logger = logging.getLogger(name)
         logger.setLevel(self.LOG_LEVELS.get(level, logging.INFO))
         
-        # Remove existing handlers
-        logger.handlers = []
+        # Attach handlers once per name; replacing them on a cache miss (new
+        # level, or eviction past maxsize) leaked file handles and dropped
+        # records still buffered in the MemoryHandlers
+        if logger.handlers:
+            return logger
         
         # Add appropriate handlers based on logger name
         handlers = self._get_handlers(name)
@@ -1,5 +1,31 @@
 # medical_patterns.py (c) drAIML MIT license
 
+from typing import Iterable, List
+
+class KeywordScanner:
+    """
+    Substring matcher over a fixed keyword list, built once at import.
+
+    Matches exactly like `keyword in text` for each keyword. Callers pass
+    text that is already lowercased, so it is case-folded once per request.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(keywords))
+        # A keyword containing a shorter one can never be the first hit
+        self._minimal = tuple(
+            keyword for keyword in self.keywords
+            if not any(other != keyword and other in keyword for other in self.keywords)
+        )
+
+    def search(self, text: str) -> bool:
+        """True if any keyword occurs in text; stops at the first hit"""
+        return any(keyword in text for keyword in self._minimal)
+
+    def findall(self, text: str) -> List[str]:
+        """All keywords occurring in text, in keyword-list order"""
+        return [keyword for keyword in self.keywords if keyword in text]
+
 class MedicalPatterns:
     """Enhanced medical pattern recognition system"""
     
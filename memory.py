@@ -348,6 +348,90 @@ class MemoryManager:
             self.logger.error("Error cleaning up memories: %s", str(e))
             return False
 
+class ChatStore:
+    """Append-only JSONL transcript for one browser session"""
+
+    def __init__(self, session_id: str, folder: str = './memory/sessions'):
+        self.logger = get_logger('memory')
+        self.session_id = session_id
+        self.folder = folder
+        self.path = os.path.join(folder, f"{session_id}.jsonl")
+        os.makedirs(folder, exist_ok=True)
+        self._count = self._count_lines()
+
+    @property
+    def count(self) -> int:
+        """Turns in the transcript file"""
+        # cleanup_idle may have removed the file under a session that is still open
+        if self._count and not os.path.exists(self.path):
+            self._count = 0
+        return self._count
+
+    def _count_lines(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'rb') as f:
+            return sum(1 for _ in f)
+
+    def append(self, role: str, content: str) -> bool:
+        """Append one chat turn to the session file"""
+        try:
+            line = json.dumps({
+                "role": role,
+                "content": content,
+                "timestamp": datetime.now().isoformat()
+            }, ensure_ascii=False)
+            # Read before the write below recreates a swept file
+            count = self.count
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+            self._count = count + 1
+            return True
+        except Exception as e:
+            self.logger.error("Error appending chat turn: %s", str(e))
+            return False
+
+    def load(self, limit: Optional[int] = None) -> List[Dict]:
+        """Read the transcript, oldest first; limit keeps only the first N turns"""
+        try:
+            if not os.path.exists(self.path):
+                return []
+            turns = []
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if limit is not None and len(turns) >= limit:
+                        break
+                    turns.append(json.loads(line))
+            return turns
+        except Exception as e:
+            self.logger.error("Error loading chat session %s: %s", self.session_id, str(e))
+            return []
+
+    def clear(self) -> bool:
+        """Delete the transcript for this session"""
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._count = 0
+            return True
+        except Exception as e:
+            self.logger.error("Error clearing chat session %s: %s", self.session_id, str(e))
+            return False
+
+    @staticmethod
+    def cleanup_idle(folder: str = './memory/sessions', max_idle_hours: int = 24) -> int:
+        """Remove session files untouched for max_idle_hours; returns the number removed"""
+        removed = 0
+        if not os.path.isdir(folder):
+            return removed
+        cutoff_time = datetime.now().timestamp() - max_idle_hours * 60 * 60
+        for filename in os.listdir(folder):
+            filepath = os.path.join(folder, filename)
+            if filename.endswith('.jsonl') and os.path.getmtime(filepath) < cutoff_time:
+                os.remove(filepath)
+                removed += 1
+        return removed
+
 # Global instance
 memory_manager = MemoryManager()
 
@@ -393,6 +477,7 @@ __all__ = [
     'DialogEntry',
     'MedicalDecision',
     'MemoryManager',
+    'ChatStore',
     'create_memory_folders',
     'store_dialog_entry',
     'store_medical_decision',
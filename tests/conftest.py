@@ -0,0 +1,17 @@
+# tests/conftest.py (c) 2025 drAIML MIT license
+
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+from pathlib import Path
+
+# Modules live at the repository root rather than in a package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Loggers, memory folders and logs are created under ./memory relative to the
+# cwd at import time; keep them out of the checkout
+_SCRATCH = tempfile.mkdtemp(prefix="draiml-tests-")
+os.chdir(_SCRATCH)
+atexit.register(shutil.rmtree, _SCRATCH, ignore_errors=True)
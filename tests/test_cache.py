@@ -0,0 +1,137 @@
+# tests/test_cache.py (c) 2025 drAIML MIT license
+
+import asyncio
+import threading
+import types
+
+import pytest
+
+import cache
+from cache import cached_response, cached_stream, response_cache, semantic_cache
+
+class Handler:
+    """Minimal handler exposing what the cache decorators key on"""
+
+    def __init__(self, temperature=0.0):
+        self.selected_model = "test-model"
+        self.system_prompt = "system"
+        self.temperature = temperature
+        self.calls = []
+
+    @cached_response
+    def complete(self, prompt: str) -> str:
+        self.calls.append(prompt)
+        return f"reply to {prompt}"
+
+    @cached_response
+    async def complete_async(self, prompt: str) -> str:
+        self.calls.append(prompt)
+        return f"reply to {prompt}"
+
+    @cached_stream
+    def stream(self, prompt: str):
+        self.calls.append(prompt)
+        yield "reply "
+        if prompt == "fail":
+            raise ConnectionError("dropped mid-stream")
+        yield f"to {prompt}"
+
+class FlatIndex:
+    """Inner-product index stub with the faiss calls SemanticCache makes"""
+
+    def __init__(self, dim):
+        self.vectors = []
+
+    @property
+    def ntotal(self):
+        return len(self.vectors)
+
+    def add(self, vectors):
+        self.vectors.extend(vectors)
+
+    def search(self, vector, k):
+        scores = [float(sum(a * b for a, b in zip(vector[0], v))) for v in self.vectors]
+        best = max(range(len(scores)), key=scores.__getitem__)
+        return [[scores[best]]], [[best]]
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    response_cache.clear()
+    semantic_cache.clear()
+    yield
+    response_cache.clear()
+    semantic_cache.clear()
+
+def test_cached_response_miss_then_hit():
+    handler = Handler()
+
+    assert handler.complete("q") == "reply to q"
+    assert handler.complete("q") == "reply to q"
+    assert asyncio.run(handler.complete_async("q")) == "reply to q"
+    assert handler.calls == ["q"]
+
+def test_cache_key_includes_model():
+    handler = Handler()
+    handler.complete("q")
+    handler.selected_model = "other-model"
+    handler.complete("q")
+
+    assert handler.calls == ["q", "q"]
+
+def test_uncacheable_handler_always_calls_through(monkeypatch):
+    monkeypatch.setattr(cache, "RESPONSE_CACHE_ENABLED", False)
+    handler = Handler(temperature=0.7)
+    handler.complete("q")
+    handler.complete("q")
+
+    assert handler.calls == ["q", "q"]
+
+def test_cached_stream_replays_a_completed_stream():
+    handler = Handler()
+
+    assert list(handler.stream("q")) == ["reply ", "to q"]
+    assert list(handler.stream("q")) == ["reply to q"]
+    assert handler.complete("q") == "reply to q"
+    assert handler.calls == ["q"]
+
+def test_cached_stream_does_not_store_a_failed_stream():
+    handler = Handler()
+    chunks = []
+
+    with pytest.raises(ConnectionError):
+        for chunk in handler.stream("fail"):
+            chunks.append(chunk)
+
+    assert chunks == ["reply "]
+    assert response_cache.get(response_cache.make_key("test-model", "system", "fail")) is None
+    with pytest.raises(ConnectionError):
+        list(handler.stream("fail"))
+    assert handler.calls == ["fail", "fail"]
+
+@pytest.fixture
+def semantic(monkeypatch):
+    """Enable the semantic cache with an encoder that waits for two callers"""
+    # Only needed for the semantic cache, which is an optional extra
+    np = pytest.importorskip("numpy")
+    barrier = threading.Barrier(2, timeout=5)
+
+    def encode(text):
+        barrier.wait()
+        vector = np.zeros((1, 4), dtype="float32")
+        vector[0, len(text) % 4] = 1.0
+        return vector
+
+    monkeypatch.setattr(semantic_cache, "enabled", True)
+    monkeypatch.setattr(semantic_cache, "_batcher", types.SimpleNamespace(encode=encode))
+    monkeypatch.setattr(semantic_cache, "_faiss", types.SimpleNamespace(IndexFlatIP=FlatIndex))
+    return barrier
+
+def test_async_semantic_lookups_do_not_block_the_loop(semantic):
+    handler = Handler()
+
+    async def both():
+        return await asyncio.gather(handler.complete_async("a"), handler.complete_async("bb"))
+
+    # Blocking lookups on the loop would leave the second caller short of the barrier
+    assert asyncio.run(both()) == ["reply to a", "reply to bb"]
+    assert not semantic.broken
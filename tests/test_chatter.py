@@ -0,0 +1,28 @@
+# tests/test_chatter.py (c) 2025 drAIML MIT license
+
+import asyncio
+
+import chatter
+
+class LoopRecorder:
+    """Handler stub that records which event loop served each call"""
+
+    def __init__(self):
+        self.loops = []
+
+    async def generate_response_async(self, prompt: str) -> str:
+        self.loops.append(asyncio.get_running_loop())
+        return prompt.upper()
+
+    async def generate_batch_async(self, prompts):
+        return [await self.generate_response_async(prompt) for prompt in prompts]
+
+def test_agenerate_runs_on_background_loop_from_another_loop():
+    handler = LoopRecorder()
+    # A sync call first, so the shared loop and its sessions already exist
+    assert chatter.generate_many(handler, ["a"]) == ["A"]
+
+    assert asyncio.run(chatter.agenerate(handler, "b")) == "B"
+    assert asyncio.run(chatter.agenerate(handler, "c")) == "C"
+
+    assert set(handler.loops) == {chatter._get_loop()}
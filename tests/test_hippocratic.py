@@ -0,0 +1,204 @@
+# tests/test_hippocratic.py (c) 2025 drAIML MIT license
+
+import os
+import json
+import itertools
+from datetime import datetime
+
+import pytest
+
+from hippocratic import HippocraticPrinciples, HippocraticReasoning, LogWriter, log_writer
+from medical_patterns import MedicalPatterns
+
+EMERGENCY_RESPONSE = "Patient reports chest pain and bleeding."
+
+PATTERN_TEXTS = [
+    "",
+    "drink water and rest. mild headache should pass.",
+    "this is severely intense and extreme pain, sharp and throbbing",
+    "your agenda includes diet and exercise; smoking and alcohol are risky. family history matters.",
+    "suspected infection, consistent with flu; prescribed antibiotics, dosage twice daily.",
+    "moderate-intensity workout, substantial improvement, medium effort",
+    "rule out migraine versus tension; physical therapy and counseling recommended",
+    "the recurring, periodic pain comes and goes; tingling and numbness; blurred vision",
+    "ageing exposure to chemicals and living conditions, travel history",
+]
+
+def _reference_patterns(text: str) -> dict:
+    """The nested substring loops the prebuilt scanners replaced"""
+    patterns = {"symptoms": [], "conditions": [], "treatments": [], "risk_factors": []}
+    for category, subcategories in MedicalPatterns.SYMPTOM_PATTERNS.items():
+        for subcategory, terms in subcategories.items():
+            matches = [term for term in terms if term in text]
+            if matches:
+                patterns["symptoms"].append(
+                    {"category": category, "subcategory": subcategory, "terms": matches}
+                )
+    for category, indicators in MedicalPatterns.CONDITION_INDICATORS.items():
+        matches = [indicator for indicator in indicators if indicator in text]
+        if matches:
+            patterns["conditions"].append({"category": category, "indicators": matches})
+    for category, terms in MedicalPatterns.TREATMENT_PATTERNS.items():
+        matches = [term for term in terms if term in text]
+        if matches:
+            patterns["treatments"].append({"category": category, "terms": matches})
+    for category, factors in MedicalPatterns.RISK_FACTORS.items():
+        matches = [factor for factor in factors if factor in text]
+        if matches:
+            patterns["risk_factors"].append({"category": category, "factors": matches})
+    return patterns
+
+@pytest.fixture
+def reasoning():
+    yield HippocraticReasoning()
+    log_writer.flush()
+
+def test_unserializable_context_does_not_hide_emergency(reasoning):
+    result = reasoning.validate_medical_response(
+        EMERGENCY_RESPONSE, {"reported_at": datetime(2025, 1, 1, 8, 30)}
+    )
+
+    assert result["emergency"] is True
+    assert reasoning.get_session_statistics()["emergency_situations"] == 1
+
+def test_unfinished_emergency_check_keeps_critical_scan(reasoning, monkeypatch):
+    monkeypatch.setattr(reasoning, "_check_emergency_situation", lambda *args: None)
+
+    result = reasoning.validate_medical_response(EMERGENCY_RESPONSE, {})
+
+    assert "Seek immediate professional medical attention" in result["recommendations"]
+    assert result["overall_score"] < 1.0
+
+def test_early_exit_keeps_the_full_denominator(reasoning, monkeypatch):
+    def failing_principle(principle, context, timestamp=None):
+        return {"principle": principle, "passed": False, "score": 0.1, "rule_results": []}
+
+    monkeypatch.setattr(reasoning, "_validate_principle", failing_principle)
+
+    # basic checks two principles at 0.6; after a 0.1 the average cannot recover
+    result = reasoning.validate_medical_response("Drink water and rest.", {}, "basic")
+
+    assert result["principles_not_evaluated"] == ["confidentiality"]
+    assert [r["principle"] for r in result["principle_results"]] == ["do_no_harm"]
+    assert result["overall_score"] == pytest.approx(0.05)
+    assert result["is_valid"] is False
+
+@pytest.mark.parametrize("text", PATTERN_TEXTS)
+def test_pattern_scanners_match_nested_substring_loops(reasoning, text):
+    assert reasoning._extract_medical_patterns(text) == _reference_patterns(text)
+
+def _reference_rule_score(rule: str, context: dict) -> float:
+    """The if/elif chain RULE_DISPATCH replaced"""
+    if "contraindications" in rule.lower():
+        return 0.8 if context["medical_patterns"]["risk_factors"] else 1.0
+    elif "risk" in rule.lower():
+        return 0.6 if context["risk_assessment"]["level"] in ["high", "critical"] else 1.0
+    elif "document" in rule.lower():
+        return 1.0 if context.get("context") else 0.8
+    return 1.0
+
+RULES = sorted({
+    rule for rules in HippocraticPrinciples.PRINCIPLE_RULES.values() for rule in rules
+}) + ["Check RISK of unlisted contraindications", "Unlisted rule"]
+
+@pytest.mark.parametrize("rule", RULES)
+def test_rule_dispatch_matches_if_elif_chain(reasoning, rule):
+    for risk_factors, level, user_context in itertools.product(
+        ([], [{"category": "lifestyle", "factors": ["smoking"]}]),
+        ("low", "moderate", "high", "critical"),
+        ({}, {"age": 40})
+    ):
+        context = {
+            "response": "",
+            "context": user_context,
+            "medical_patterns": {"risk_factors": risk_factors},
+            "risk_assessment": {"level": level}
+        }
+        score = _reference_rule_score(rule, context)
+
+        assert reasoning._check_validation_rule(rule, context) == {
+            "rule": rule, "passed": score >= 0.7, "score": score, "details": []
+        }
+
+def _read_lines(path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_log_writer_keeps_arrival_order_per_file(tmp_path):
+    writer = LogWriter(max_batch=7)
+    first, second = tmp_path / "first.jsonl", tmp_path / "second.jsonl"
+    for i in range(1000):
+        writer.write(str(first if i % 3 else second), {"seq": i})
+    writer.flush()
+
+    assert [e["seq"] for e in _read_lines(first)] == [i for i in range(1000) if i % 3]
+    assert [e["seq"] for e in _read_lines(second)] == list(range(0, 1000, 3))
+    writer.close()
+
+def test_log_writer_snapshots_entries_when_queued(tmp_path):
+    writer = LogWriter()
+    path = tmp_path / "log.jsonl"
+    entry = {"findings": ["fever"]}
+    writer.write(str(path), entry)
+    entry["findings"].append("rash")
+    writer.close()
+
+    assert _read_lines(path) == [{"findings": ["fever"]}]
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    """Record the descriptors passed to os.fsync"""
+    calls = []
+    real_fsync = os.fsync
+
+    def recording_fsync(fd):
+        calls.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+    return calls
+
+def test_log_writer_close_writes_and_syncs_queued_entries(tmp_path, fsyncs):
+    # Thresholds the entries never reach, so only close() can sync them
+    writer = LogWriter(fsync_every=10000, fsync_interval=3600)
+    path = tmp_path / "log.jsonl"
+    for i in range(5):
+        writer.write(str(path), {"seq": i})
+    writer.close()
+
+    assert [e["seq"] for e in _read_lines(path)] == list(range(5))
+    assert fsyncs
+    assert writer._files == {} and writer._unsynced == {}
+
+def test_emergency_entries_are_durable_before_returning(reasoning, fsyncs):
+    principles = reasoning.principles
+    path = principles.log_paths["emergency_logs"]
+    before = len(_read_lines(path)) if os.path.exists(path) else 0
+
+    # No flush: the entry must already be written and synced
+    principles.log_emergency({"text": "chest pain", "context": {}})
+
+    assert len(_read_lines(path)) == before + 1
+    assert log_writer._files[path].fileno() in fsyncs
+
+def test_log_writer_queue_is_bounded():
+    writer = LogWriter(max_queue=3)
+
+    assert writer._queue.maxsize == 3
+    writer.close()
+
+@pytest.mark.parametrize("text, bucket, term", [
+    ("severely swollen", "symptoms", "severe"),
+    ("persistently elevated", "symptoms", "persistent"),
+    ("a nonrecurring rash", "symptoms", "recurring"),
+    ("the ache comes and goes", "symptoms", "comes and goes"),
+])
+def test_patterns_match_inside_longer_words(reasoning, text, bucket, term):
+    # Substring semantics; a word-token (or bigram) intersection misses each of these
+    found = [
+        match
+        for entry in reasoning._extract_medical_patterns(text)[bucket]
+        for field in ("terms", "indicators", "factors") if field in entry
+        for match in entry[field]
+    ]
+    assert term in found
@@ -0,0 +1,45 @@
+# tests/test_medical_patterns.py (c) 2025 drAIML MIT license
+
+import pytest
+
+from hippocratic import HippocraticPrinciples
+from medical_patterns import KeywordScanner
+
+EMERGENCY_KEYWORDS = HippocraticPrinciples.EMERGENCY_KEYWORDS
+
+TEXTS = [
+    "",
+    "drink water and rest; a mild headache should pass.",
+    "patient reports chest pain and bleeding.",
+    "severe pain after a head injury",
+    "he had a seizure, then became unconscious",
+    "breathing difficulty",
+    "breathing is fine, no difficulty",
+    "strokes of luck",
+    "anaphylaxis risk with peanuts",
+    "chest painful",
+    "heart attacks run in the family",
+] + [f"note: {keyword} reported" for keyword in EMERGENCY_KEYWORDS]
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_search_matches_substring_checks(text):
+    scanner = KeywordScanner(EMERGENCY_KEYWORDS)
+
+    assert scanner.search(text) == any(keyword in text for keyword in EMERGENCY_KEYWORDS)
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_findall_matches_substring_checks(text):
+    scanner = KeywordScanner(EMERGENCY_KEYWORDS)
+
+    assert scanner.findall(text) == [keyword for keyword in EMERGENCY_KEYWORDS if keyword in text]
+
+def test_minimal_drops_keywords_containing_shorter_ones():
+    scanner = KeywordScanner(["chest pain", "pain", "bleeding", "pain"])
+
+    assert scanner.keywords == ("chest pain", "pain", "bleeding")
+    assert scanner._minimal == ("pain", "bleeding")
+    # Dropping "chest pain" from the search set never changes the answer
+    assert scanner.search("chest pain") is True
+    assert scanner.search("chest tightness") is False
+    # findall still reports every keyword, overlapping ones included
+    assert scanner.findall("chest pain and bleeding") == ["chest pain", "pain", "bleeding"]
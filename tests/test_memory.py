@@ -0,0 +1,57 @@
+# tests/test_memory.py (c) 2025 drAIML MIT license
+
+import os
+import time
+
+from memory import ChatStore
+
+def test_cleanup_idle_removes_only_stale_sessions(tmp_path):
+    stale = tmp_path / "stale.jsonl"
+    fresh = tmp_path / "fresh.jsonl"
+    stale.write_text('{"role": "user", "content": "old"}\n', encoding="utf-8")
+    fresh.write_text('{"role": "user", "content": "new"}\n', encoding="utf-8")
+    day_ago = time.time() - 25 * 60 * 60
+    os.utime(stale, (day_ago, day_ago))
+
+    removed = ChatStore.cleanup_idle(folder=str(tmp_path), max_idle_hours=24)
+
+    assert removed == 1
+    assert not stale.exists()
+    assert fresh.exists()
+
+def test_append_load_and_clear(tmp_path):
+    store = ChatStore("abc", folder=str(tmp_path))
+    for i in range(4):
+        assert store.append("user" if i % 2 == 0 else "assistant", f"turn {i} – café")
+
+    assert store.count == 4
+    turns = store.load()
+    assert [(t["role"], t["content"]) for t in turns] == [
+        ("user", "turn 0 – café"), ("assistant", "turn 1 – café"),
+        ("user", "turn 2 – café"), ("assistant", "turn 3 – café")
+    ]
+    assert [t["content"] for t in store.load(limit=2)] == ["turn 0 – café", "turn 1 – café"]
+
+    assert store.clear()
+    assert store.count == 0
+    assert store.load() == []
+
+def test_reopened_store_counts_existing_turns(tmp_path):
+    ChatStore("abc", folder=str(tmp_path)).append("user", "hello")
+
+    assert ChatStore("abc", folder=str(tmp_path)).count == 1
+
+def test_count_resets_when_cleanup_removes_an_open_session(tmp_path):
+    store = ChatStore("abc", folder=str(tmp_path))
+    store.append("user", "hello")
+    store.append("assistant", "hi")
+    day_ago = time.time() - 25 * 60 * 60
+    os.utime(store.path, (day_ago, day_ago))
+
+    assert ChatStore.cleanup_idle(folder=str(tmp_path)) == 1
+
+    assert store.count == 0
+    assert store.load(limit=store.count) == []
+    store.append("user", "back again")
+    assert store.count == 1
+    assert [t["content"] for t in store.load()] == ["back again"]